@@ -1,44 +1,363 @@
 import cv2
 from datetime import datetime
 import os
-from PIL import Image
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import numpy as np
 
+from camera.frame_grabber import FrameGrabber
+from camera.camera_profile import CameraProfile
+from camera.frame_sources import OpenCVSource
+from camera.photo_writer import PhotoWriter
+from camera.derivatives import DerivativeBuilder
+from camera.filter_engine import FilterEngine
+from camera.template_cache import TemplateCache
+from camera.strip_compositor import StripCompositor
+from camera.contact_sheet import CollageBuilder, first_image_size
+
 class CameraController:
-    def __init__(self, camera_index=0, resolution=(1920, 1080)):
+    def __init__(self, camera_index=0, resolution=(1920, 1080), use_grabber=False, buffer_size=4,
+                 preview_profiles=None, still_profile=None, switch_budget_ms=500, source=None,
+                 zero_shutter_lag=False, zsl_frames=8, zsl_pre_ms=100, async_writes=False,
+                 renditions=None, rendition_codec=".jpg"):
         """
         Initialize camera controller
         
         Args:
             camera_index: Camera device index (0 or 1)
             resolution: Tuple of (width, height)
+            use_grabber: Read frames on a background thread instead of
+                blocking the caller on every get_frame()
+            buffer_size: Number of recent frames kept by the grabber
+            preview_profiles: CameraProfiles to try for the live preview, in
+                order of preference. None keeps the camera at the still profile.
+            still_profile: CameraProfile used for saved photos (defaults to
+                MJPG at resolution)
+            switch_budget_ms: Maximum preview -> still -> preview round trip
+                allowed before dual mode is given up
+            source: FrameSource to read from (defaults to the real camera
+                at camera_index)
+            zero_shutter_lag: Pick the sharpest buffered full resolution
+                frame around the shutter instead of reading a new one
+                (needs the grabber)
+            zsl_frames: Full resolution frames kept around the shutter
+            zsl_pre_ms: How far before the shutter a frame may be picked
+            async_writes: Encode and write photos on a background thread,
+                take_photo returns as soon as the photo is queued
+            renditions: (name, longest side, quality) of the smaller copies
+                built for every photo (see DerivativeBuilder)
+            rendition_codec: ".jpg" or ".webp" for the renditions
         """
         self.camera_index = camera_index
         self.resolution = resolution
+        self.source = source or OpenCVSource(camera_index)
         self.camera = None
         self.is_open = False
         self.last_frame = None
+
+        # Background frame grabber (opt-in)
+        self.use_grabber = use_grabber
+        self.buffer_size = max(buffer_size, zsl_frames) if zero_shutter_lag else buffer_size
+        self.grabber = None
+
+        # Serializes reads and mode changes between the grabber and callers
+        self.capture_lock = threading.Lock()
+
+        # Preview/still profiles
+        self.still_profile = still_profile or CameraProfile("still", resolution)
+        self.preview_profiles = list(preview_profiles or [])
+        self.preview_profile = self.still_profile
+        self.active_profile = None
+        self.dual_mode = False
+        self.switch_budget_ms = switch_budget_ms
+        self.last_switch_times = {}  # profile name -> last switch cost in ms
+
+        # Zero shutter lag
+        self.zero_shutter_lag = zero_shutter_lag
+        self.zsl_pre_ms = zsl_pre_ms
+        self.still_prepared = False
+        self.prepare_future = None
+        # Single worker so profile switches run in the order they were asked for
+        self.profile_executor = ThreadPoolExecutor(max_workers=1)
+        self.last_capture_info = None
+
+        # Background JPEG writer (opt-in)
+        self.photo_writer = PhotoWriter(max_pending=4, quality=95) if async_writes else None
+        self.last_write_future = None
+
+        # Thumbnail/review/email sizes of every photo, built in the background
+        self.derivatives = DerivativeBuilder(renditions=renditions, codec=rendition_codec)
+
+        # Filters are compiled once here instead of on every call
+        self.filter_engine = FilterEngine()
+
+        # Strip templates, decoded and resized once per file version
+        self.template_cache = TemplateCache()
+        self.strip_compositor = StripCompositor(self.template_cache)
+
+        # Collages and contact sheets, drawn into one canvas by a worker pool
+        self.collage_builder = CollageBuilder()
         
     def open_camera(self):
         """Open the camera connection"""
-        self.camera = cv2.VideoCapture(self.camera_index)
+        self.camera = self.source
         
-        if self.camera.isOpened():
-            # Set resolution
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
-            
+        if self.camera.open():
             # Optional: Set other properties
             self.camera.set(cv2.CAP_PROP_AUTOFOCUS, 1)  # Enable autofocus
             self.camera.set(cv2.CAP_PROP_AUTO_EXPOSURE, 1)  # Enable auto exposure
             
             self.is_open = True
+
+            # Set resolution / format for the live preview
+            if self.preview_profiles:
+                self.choose_preview_profile()
+            else:
+                self.apply_profile(self.still_profile)
             print(f"Camera opened at {self.get_actual_resolution()}")
+
+            if self.use_grabber:
+                self.start_grabber()
             return True
         else:
             print("Failed to open camera")
             self.is_open = False
             return False
+
+    def apply_profile(self, profile, max_reads=10):
+        """
+        Switch the camera to a profile and wait for the first frame in it
+        
+        Caller must hold the camera (see exclusive_camera) if the grabber runs.
+        
+        Args:
+            profile: CameraProfile to apply
+            max_reads: Frames to read looking for one at the new size
+        Returns:
+            Switch cost in milliseconds, or None if no frame arrived at the
+            resolution the driver reported
+        """
+        switch_ms, _ = self.switch_profile(profile, max_reads)
+        return switch_ms
+
+    def switch_profile(self, profile, max_reads=10):
+        """
+        Same as apply_profile but also returns the first frame in the new mode
+        
+        Returns:
+            Tuple (switch_ms, frame), (None, None) on failure
+        """
+        start = time.monotonic()
+
+        # Pixel format has to be set before the size on V4L2
+        if profile.fourcc:
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, profile.resolution[0])
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.resolution[1])
+        if profile.fps:
+            self.camera.set(cv2.CAP_PROP_FPS, profile.fps)
+        self.active_profile = profile
+
+        # Frames already queued in the driver can still be at the old size
+        width, height = self.get_actual_resolution()
+        for _ in range(max_reads):
+            ret, frame = self.camera.read()
+            if ret and frame.shape[1] == width and frame.shape[0] == height:
+                switch_ms = (time.monotonic() - start) * 1000
+                self.last_switch_times[profile.name] = switch_ms
+                return switch_ms, frame
+
+        print(f"Camera gave no {width}x{height} frame after switching to {profile}")
+        return None, None
+
+    def choose_preview_profile(self):
+        """
+        Pick the live preview profile
+        
+        Measures the preview -> still -> preview round trip for each
+        candidate and keeps the first one inside switch_budget_ms. If none
+        fits, the preview runs at the still profile and take_photo never
+        has to switch.
+        Returns: The chosen preview profile
+        """
+        for profile in self.preview_profiles:
+            to_preview_ms = self.apply_profile(profile)
+            if to_preview_ms is None or self.get_actual_resolution() == self.still_profile.resolution:
+                print(f"Preview profile {profile} not supported")
+                continue
+
+            to_still_ms = self.apply_profile(self.still_profile)
+            back_ms = self.apply_profile(profile)
+            if to_still_ms is None or back_ms is None:
+                print(f"Still profile {self.still_profile} not supported from {profile}")
+                continue
+
+            round_trip_ms = to_still_ms + back_ms
+            if round_trip_ms <= self.switch_budget_ms:
+                self.preview_profile = profile
+                self.dual_mode = True
+                print(f"Preview profile {profile}: switch to still {to_still_ms:.0f} ms, "
+                      f"back {back_ms:.0f} ms (budget {self.switch_budget_ms} ms)")
+                return profile
+
+            print(f"Preview profile {profile} rejected: round trip {round_trip_ms:.0f} ms "
+                  f"over budget {self.switch_budget_ms} ms")
+
+        # Single stream - preview at full resolution like before
+        self.preview_profile = self.still_profile
+        self.dual_mode = False
+        self.apply_profile(self.still_profile)
+        print(f"Dual mode disabled, previewing at {self.still_profile}")
+        return self.still_profile
+
+    @contextmanager
+    def exclusive_camera(self):
+        """Pause the grabber and hold the camera for direct reads or mode changes"""
+        if self.grabber is not None:
+            self.grabber.pause()
+        try:
+            # Waits for a read already in progress on the grabber thread
+            with self.capture_lock:
+                yield self.camera
+        finally:
+            if self.grabber is not None:
+                self.grabber.resume()
+
+    def read_locked(self):
+        """Read one frame while holding the capture lock"""
+        with self.capture_lock:
+            return self.camera.read()
+
+    def capture_still_frame(self):
+        """
+        Grab one full resolution frame, switching profiles if needed
+        
+        In dual mode the camera goes to the still profile for a single read
+        and straight back to the preview profile.
+        Returns: numpy array (BGR format) or None
+        """
+        if not self.dual_mode:
+            return self.get_frame()
+
+        with self.exclusive_camera():
+            start = time.monotonic()
+            # The first frame at the new size is the photo
+            to_still_ms, frame = self.switch_profile(self.still_profile)
+            back_ms = self.apply_profile(self.preview_profile)
+            total_ms = (time.monotonic() - start) * 1000
+
+        # Buffered preview frames are now older than the still
+        if self.grabber is not None:
+            self.grabber.clear()
+
+        print(f"Still capture: to still {to_still_ms or 0:.0f} ms, back {back_ms or 0:.0f} ms, "
+              f"total {total_ms:.0f} ms")
+        if total_ms > self.switch_budget_ms:
+            print(f"WARNING: still capture over switch budget ({self.switch_budget_ms} ms)")
+
+        if frame is None:
+            print("Failed to capture still frame")
+            return None
+        self.last_frame = frame
+        return frame
+    
+    def prepare_still(self):
+        """
+        Start streaming full resolution frames ahead of the shutter
+        
+        Call a second or so before the photo. In dual mode the switch to
+        the still profile runs on a worker thread so the countdown isn't
+        held up; the grabber buffer then fills with full resolution frames
+        for take_photo(shutter_time=...) to choose from.
+        """
+        if not self.zero_shutter_lag or not self.is_grabbing() or self.still_prepared:
+            return
+        self.still_prepared = True
+        if self.dual_mode:
+            self.prepare_future = self.profile_executor.submit(self._switch_in_background, self.still_profile)
+
+    def finish_still(self):
+        """Go back to the preview profile after prepare_still()"""
+        if not self.still_prepared:
+            return
+        self.still_prepared = False
+        if self.dual_mode:
+            self.profile_executor.submit(self._switch_in_background, self.preview_profile)
+
+    def _switch_in_background(self, profile):
+        """Switch profile with the grabber paused, then drop frames of the old size"""
+        with self.exclusive_camera():
+            switch_ms = self.apply_profile(profile)
+            if self.grabber is not None:
+                self.grabber.clear()
+        print(f"Switched to {profile} in {switch_ms or 0:.0f} ms")
+        return switch_ms
+
+    def score_sharpness(self, frame, score_width=480):
+        """
+        Sharpness of a frame as the variance of its Laplacian
+        
+        Computed on a subsampled green channel (every Nth pixel, no
+        filtering so fine detail survives), which keeps scoring a full HD
+        frame around a millisecond. Higher is sharper.
+        
+        Args:
+            frame: BGR frame
+            score_width: Approximate width the frame is subsampled to
+        Returns: Float score
+        """
+        step = max(1, frame.shape[1] // score_width)
+        gray = np.ascontiguousarray(frame[::step, ::step, 1])
+        _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+        return float(stddev[0][0]) ** 2
+
+    def select_best_frame(self, shutter_time):
+        """
+        Pick the sharpest full resolution frame buffered around the shutter
+        
+        Args:
+            shutter_time: time.monotonic() when the countdown reached zero
+        Returns: numpy array (BGR format) or None
+        """
+        if self.prepare_future is not None:
+            try:
+                # Make sure the buffer holds still profile frames
+                self.prepare_future.result(timeout=2.0)
+            except Exception as e:
+                print(f"Still profile switch failed: {e}")
+            self.prepare_future = None
+
+        candidates = self.grabber.get_frames_since(shutter_time - self.zsl_pre_ms / 1000)
+        if not candidates:
+            entry = self.grabber.wait_for_frame(timeout=1.0)
+            if entry is None:
+                return None
+            candidates = [entry]
+
+        # Only compare frames at the largest size in the window
+        largest = max(entry[2].shape for entry in candidates)
+        candidates = [entry for entry in candidates if entry[2].shape == largest]
+
+        start = time.monotonic()
+        scored = [(self.score_sharpness(self.crop_to_square(entry[2])), entry) for entry in candidates]
+        score, (frame_id, timestamp, frame) = max(scored, key=lambda item: item[0])
+        score_ms = (time.monotonic() - start) * 1000
+
+        lag_ms = (timestamp - shutter_time) * 1000
+        self.last_capture_info = {
+            "frame_id": frame_id,
+            "lag_ms": lag_ms,
+            "score": score,
+            "candidates": len(candidates),
+            "score_ms": score_ms,
+        }
+        print(f"Zero shutter lag: frame {lag_ms:+.0f} ms from shutter, sharpness {score:.1f} "
+              f"(best of {len(candidates)}, scored in {score_ms:.0f} ms)")
+
+        self.last_frame = frame
+        return frame
     
     def get_actual_resolution(self):
         """Get the actual resolution the camera is using"""
@@ -47,17 +366,62 @@ class CameraController:
         width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
         return (width, height)
+
+    def start_grabber(self):
+        """Start reading frames on a background thread"""
+        if not self.is_open:
+            print("Camera not open - grabber not started")
+            return False
+        if self.grabber is None:
+            self.grabber = FrameGrabber(self.read_locked, buffer_size=self.buffer_size)
+        self.grabber.start()
+        return True
+
+    def stop_grabber(self):
+        """Stop the background grabber, get_frame() reads directly again"""
+        if self.grabber is not None:
+            self.grabber.stop()
+            self.grabber = None
+
+    def is_grabbing(self):
+        """Check if the background grabber is running"""
+        return self.grabber is not None and self.grabber.running
+
+    def get_grabber_stats(self):
+        """
+        Get dropped-frame and frame-age counters from the grabber
+        Returns: Dictionary of stats or None if the grabber is not running
+        """
+        if not self.is_grabbing():
+            return None
+        return self.grabber.get_stats()
+
+    def reset_grabber_stats(self):
+        """Reset the grabber counters (e.g. at the start of a preview)"""
+        if self.is_grabbing():
+            self.grabber.reset_stats()
     
     def get_frame(self):
         """
         Get a single frame from camera
+        
+        With the grabber running this returns the newest buffered frame
+        without blocking (None until the first frame arrives).
         Returns: numpy array (BGR format) or None
         """
         if not self.is_open or self.camera is None:
             print("Camera not open")
             return None
+
+        if self.is_grabbing():
+            entry = self.grabber.get_latest()
+            if entry is None:
+                return None
+            frame = entry[2]
+            self.last_frame = frame
+            return frame
             
-        ret, frame = self.camera.read()
+        ret, frame = self.read_locked()
         if ret:
             self.last_frame = frame
             return frame
@@ -109,7 +473,7 @@ class CameraController:
         
         return cropped
 
-    def take_photo(self, save_dir="photos", filename=None, crop_square=True):
+    def take_photo(self, save_dir="photos", filename=None, crop_square=True, shutter_time=None):
         """
         Capture and save a photo
         
@@ -117,17 +481,39 @@ class CameraController:
             save_dir: Directory to save photos
             filename: Custom filename (without extension) or None for timestamp
             crop_square: Whether to crop image to square before saving
-        Returns: filepath if successful, None if failed
+            shutter_time: time.monotonic() of the shutter moment. With zero
+                shutter lag on, the sharpest frame around it is saved.
+        Returns:
+            Tuple (filepath, frame) - the saved photo (cropped, BGR) is
+            returned so it can be shown without waiting for the file.
+            (None, None) if failed.
         """
-        frame = self.get_frame()
+        frame = None
+        if shutter_time is not None and self.zero_shutter_lag and self.is_grabbing():
+            frame = self.select_best_frame(shutter_time)
+
+        if frame is None:
+            if self.still_prepared and self.is_grabbing():
+                # Camera is already streaming the still profile
+                entry = self.grabber.wait_for_frame(timeout=1.0)
+                frame = entry[2] if entry is not None else None
+            else:
+                shutter_time = time.monotonic()
+                frame = self.capture_still_frame()
+                self.last_capture_info = {
+                    "lag_ms": (time.monotonic() - shutter_time) * 1000,
+                    "score": None,
+                }
+
+        self.finish_still()
         
         if frame is None:
-            return None
+            return None, None
         
         # Crop to square if requested
         if crop_square:
             frame = self.crop_to_square(frame)
-        
+
         # Create photos directory if it doesn't exist
         os.makedirs(save_dir, exist_ok=True)
         
@@ -139,10 +525,55 @@ class CameraController:
         filepath = os.path.join(save_dir, f"{filename}.jpg")
         
         # Save the photo with high quality
-        cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-        print(f"Photo saved: {filepath}")
+        if self.photo_writer is not None:
+            # Written in the background, see wait_for_photo / wait_for_writes
+            self.last_write_future = self.photo_writer.submit(frame, filepath, quality=95)
+            print(f"Photo queued: {filepath}")
+        else:
+            cv2.imwrite(filepath, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            print(f"Photo saved: {filepath}")
+
+        # Smaller copies from the frame in memory, no decode needed
+        self.derivatives.submit(filepath, frame)
         
-        return filepath
+        return filepath, frame
+
+    def wait_for_photo(self, filepath, timeout=5.0):
+        """
+        Wait until a photo from take_photo is completely on disk
+        
+        Args:
+            filepath: Path returned by take_photo
+            timeout: Maximum seconds to wait
+        Returns: True if the file is written
+        """
+        if self.photo_writer is not None:
+            future = self.photo_writer.get_future(filepath)
+            if future is not None:
+                try:
+                    future.result(timeout=timeout)
+                except Exception as e:
+                    print(f"Photo not written: {filepath} ({e})")
+                    return False
+        return os.path.exists(filepath)
+
+    def wait_for_writes(self, timeout=10.0):
+        """
+        Wait for all queued photos to be written
+        Returns: True if everything finished in time
+        """
+        if self.photo_writer is None:
+            return True
+        return self.photo_writer.wait_all(timeout=timeout)
+
+    def get_writer_stats(self):
+        """
+        Get background writer counters
+        Returns: Dictionary of stats or None if writes are synchronous
+        """
+        if self.photo_writer is None:
+            return None
+        return self.photo_writer.get_stats()
     
     def capture_multiple(self, count=4, delay=1.0, save_dir="photos"):
         """
@@ -163,45 +594,31 @@ class CameraController:
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"photo_{timestamp}_img{i+1}"
-            filepath = self.take_photo(save_dir=save_dir, filename=filename)
+            filepath, _ = self.take_photo(save_dir=save_dir, filename=filename)
             
             if filepath:
                 filepaths.append(filepath)
         
         return filepaths
     
-    def apply_filter(self, frame, filter_type="none"):
+    def apply_filter(self, frame, filter_type="none", in_place=False):
         """
         Apply filters to a frame
         
         Args:
             frame: Input frame (numpy array)
             filter_type: "none", "grayscale", "sepia", "blur", "sharpen"
-        Returns: Filtered frame
+            in_place: Write the result into frame (e.g. reused preview buffers)
+        Returns: Filtered frame (always 3-channel BGR)
         """
-        if frame is None:
-            return None
-        
-        if filter_type == "grayscale":
-            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        elif filter_type == "sepia":
-            kernel = np.array([[0.272, 0.534, 0.131],
-                              [0.349, 0.686, 0.168],
-                              [0.393, 0.769, 0.189]])
-            return cv2.transform(frame, kernel)
-        
-        elif filter_type == "blur":
-            return cv2.GaussianBlur(frame, (15, 15), 0)
-        
-        elif filter_type == "sharpen":
-            kernel = np.array([[-1,-1,-1],
-                              [-1, 9,-1],
-                              [-1,-1,-1]])
-            return cv2.filter2D(frame, -1, kernel)
-        
-        else:  # "none"
-            return frame
+        return self.filter_engine.apply(frame, filter_type, in_place=in_place)
+
+    def get_filter_stats(self):
+        """
+        Get per-filter timing, to see which filters are fast enough for the live preview
+        Returns: Dictionary of "filter WxH" -> {count, avg_ms, max_ms}
+        """
+        return self.filter_engine.get_stats()
     
     def save_frame(self, frame, filepath):
         """
@@ -234,37 +651,27 @@ class CameraController:
         if not image_paths:
             return None
         
-        images = []
-        for path in image_paths:
-            img = cv2.imread(path)
-            if img is not None:
-                images.append(img)
-        
-        if not images:
+        # Tiles are the first image's size divided by the grid, as before
+        size = first_image_size(image_paths)
+        if size is None:
             return None
-        
+        w, h = size
         rows, cols = layout
-        
-        # Resize all images to same size
-        h, w = images[0].shape[:2]
         target_size = (w // cols, h // rows)
         
-        resized_images = [cv2.resize(img, target_size) for img in images]
-        
-        # Create collage
-        collage_rows = []
-        for i in range(rows):
-            row_images = resized_images[i*cols:(i+1)*cols]
-            if row_images:
-                row = np.hstack(row_images)
-                collage_rows.append(row)
-        
-        if collage_rows:
-            collage = np.vstack(collage_rows)
-            cv2.imwrite(output_path, collage)
-            return output_path
+        return self.collage_builder.build(image_paths, output_path, layout, target_size)
+
+    def create_contact_sheet(self, party_folder, output_path=None, columns=10):
+        """
+        Create an overview image of every strip in a party folder
         
-        return None
+        Args:
+            party_folder: Folder with the party's strips
+            output_path: Where to save it (None for the party folder)
+            columns: Strips per row
+        Returns: Path to contact sheet or None
+        """
+        return self.collage_builder.contact_sheet(party_folder, output_path, columns=columns)
     
     def flip_frame(self, frame, horizontal=True):
         """
@@ -296,111 +703,76 @@ class CameraController:
         return cv2.convertScaleAbs(frame, alpha=factor, beta=0)
     
     def close_camera(self):
-        """Release the camera"""
-        if self.camera is not None:
+        """Release the camera (safe to call again, open_camera works after it)"""
+        # Let queued profile switches, photos, renditions and strips finish.
+        # Fresh executors only start threads when used, so a later
+        # open_camera can switch profiles again.
+        self.profile_executor.shutdown(wait=True)
+        self.profile_executor = ThreadPoolExecutor(max_workers=1)
+        self.wait_for_writes()
+        self.derivatives.shutdown()
+        self.strip_compositor.shutdown()
+        self.stop_grabber()
+        self.still_prepared = False
+        if self.camera is not None and self.is_open:
             self.camera.release()
             self.is_open = False
             print("Camera closed")
     
     def __del__(self):
         """Cleanup when object is destroyed"""
-        self.close_camera()
+        # __init__ may have failed before everything close_camera uses existed
+        if hasattr(self, "strip_compositor"):
+            self.close_camera()
+
+
 
+    def get_strip_layout(self, template_path):
+        """
+        Get the strip layout that goes with a template
+        
+        Args:
+            template_path: Path to template image
+        Returns:
+            StripLayout (shot_count, canvas_size, dpi, ...)
+        """
+        return self.strip_compositor.get_layout(template_path)
 
+    def begin_photo_strip(self, template_path):
+        """
+        Start a strip that photos are pasted into as they are taken
+        
+        Args:
+            template_path: Path to template image
+        Returns:
+            StripBuild - call add_photo(index, frame) per photo and
+            finish(output_path) at the end
+        """
+        return self.strip_compositor.begin_strip(template_path)
 
-    def create_photo_strip(self, image_paths, template_path, output_path):
+    def create_photo_strip(self, image_paths, template_path, output_path, frames=None):
         """
         Create a photo strip collage using a template
         
         Args:
-            image_paths: List of 3 photo file paths
+            image_paths: List of photo file paths (one per layout photo)
             template_path: Path to template image
             output_path: Where to save the final collage
+            frames: Optional list of the same photos already in memory
+                (BGR, cropped), used instead of reading image_paths
         Returns:
             Path to saved collage or None
         """
-        import cv2
-        from PIL import Image
-        
-        if len(image_paths) != 3:
-            print(f"Need exactly 3 photos, got {len(image_paths)}")
-            return None
+        photos = image_paths
+        if frames is not None and len(frames) == len(image_paths) and all(f is not None for f in frames):
+            photos = frames
         
         try:
             print(f"Loading template from: {template_path}")
-            
-            # Check if template exists
-            if not os.path.exists(template_path):
-                print(f"ERROR: Template not found at {template_path}")
-                return None
-            
-            # Load template
-            template = Image.open(template_path).convert('RGB')
-            print(f"Template loaded, original size: {template.size}")
-            
-            # 4x6 photo at 300 DPI = 1200x1800 pixels
-            target_size = (1200, 1800)
-            template = template.resize(target_size, Image.Resampling.LANCZOS)
-            print(f"Template resized to: {target_size}")
-            
-            # Start with the template as the base
-            final_image = template.copy()
-            
-            # Photo positions for LEFT strip (x, y, width, height)
-            left_positions = [
-                (65, 50, 460, 460),      # Top left photo
-                (65, 540, 460, 460),     # Middle left photo
-                (65, 1030, 460, 460)      # Bottom left photo
-            ]
-            
-            # Photo positions for RIGHT strip
-            right_positions = [
-                (680, 50, 460, 460),     # Top right photo
-                (680, 540, 460, 460),    # Middle right photo
-                (680, 1030, 460, 460)     # Bottom right photo
-            ]
-            
-            # Load and place photos ON TOP of template
-            for i, photo_path in enumerate(image_paths):
-                print(f"Processing photo {i+1}: {photo_path}")
-                
-                # Check if photo exists
-                if not os.path.exists(photo_path):
-                    print(f"ERROR: Photo not found: {photo_path}")
-                    continue
-                
-                # Load photo
-                photo = cv2.imread(photo_path)
-                if photo is None:
-                    print(f"ERROR: Could not load photo: {photo_path}")
-                    continue
-                
-                print(f"Photo {i+1} loaded, size: {photo.shape}")
-                
-                # Convert BGR to RGB
-                photo_rgb = cv2.cvtColor(photo, cv2.COLOR_BGR2RGB)
-                photo_pil = Image.fromarray(photo_rgb)
-                
-                # Place on LEFT strip
-                x, y, w, h = left_positions[i]
-                photo_resized = photo_pil.resize((w, h), Image.Resampling.LANCZOS)
-                final_image.paste(photo_resized, (x, y))
-                print(f"Pasted photo {i+1} on left at ({x}, {y})")
-                
-                # Place on RIGHT strip
-                x, y, w, h = right_positions[i]
-                photo_resized_right = photo_pil.resize((w, h), Image.Resampling.LANCZOS)
-                final_image.paste(photo_resized_right, (x, y))
-                print(f"Pasted photo {i+1} on right at ({x}, {y})")
-            
-            # Save as high-quality JPEG
-            final_image.save(output_path, 'JPEG', quality=95, dpi=(300, 300))
-            print(f"Photo strip saved: {output_path}")
-            
-            return output_path
+            return self.strip_compositor.create_strip(photos, template_path, output_path)
             
         except Exception as e:
             print(f"Error creating photo strip: {e}")
             import traceback
             traceback.print_exc()
-            return None
\ No newline at end of file
+            return None
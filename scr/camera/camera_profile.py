@@ -0,0 +1,30 @@
+class CameraProfile:
+    def __init__(self, name, resolution, fourcc="MJPG", fps=30):
+        """
+        Capture settings for one camera mode
+
+        Args:
+            name: Label used in log output
+            resolution: Tuple of (width, height)
+            fourcc: Four character pixel format ("MJPG", "YUYV") or None
+                to keep the driver default
+            fps: Requested frame rate
+        """
+        self.name = name
+        self.resolution = resolution
+        self.fourcc = fourcc
+        self.fps = fps
+
+    def __repr__(self):
+        width, height = self.resolution
+        return f"{self.name} {width}x{height} {self.fourcc or 'default'}@{self.fps}"
+
+
+# Live preview only fills the 540x540 label, 720p still crops to a 720x720 square
+PREVIEW_PROFILE = CameraProfile("preview", (1280, 720), "MJPG", 30)
+
+# Smaller fallback for cameras that can't switch quickly out of 720p
+PREVIEW_PROFILE_SMALL = CameraProfile("preview_small", (640, 480), "MJPG", 30)
+
+# Full resolution for the saved photos
+STILL_PROFILE = CameraProfile("still", (1920, 1080), "MJPG", 30)
@@ -0,0 +1,194 @@
+import glob
+import math
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# JPEG decoders can scale by 1/2, 1/4 and 1/8 while decoding (DCT scaling)
+REDUCED_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+]
+
+
+def read_reduced(path, min_size):
+    """
+    Decode an image no bigger than needed to still cover min_size
+
+    Only the file header is read to get the full size, then the largest
+    DCT reduction that keeps the image at least min_size is used, which
+    skips most of the decode work for small tiles.
+
+    Args:
+        path: Image file
+        min_size: Tuple (width, height) the image must still cover
+    Returns: BGR numpy array or None
+    """
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+    except Exception:
+        return None
+
+    min_w, min_h = min_size
+    for factor, flag in REDUCED_FLAGS:
+        if width // factor >= min_w and height // factor >= min_h:
+            return cv2.imread(path, flag)
+    return cv2.imread(path)
+
+
+def first_image_size(paths):
+    """
+    Size of the first image in paths that can be opened
+    Returns: Tuple (width, height) or None if none can
+    """
+    for path in paths:
+        try:
+            with Image.open(path) as image:
+                return image.size
+        except Exception:
+            print(f"ERROR: Could not load: {path}")
+    return None
+
+
+def strip_sort_key(path):
+    """Sort strip_2.jpg before strip_10.jpg"""
+    numbers = re.findall(r"\d+", os.path.basename(path))
+    return [int(n) for n in numbers], path
+
+
+class CollageBuilder:
+    def __init__(self, max_workers=4, quality=90):
+        """
+        Grid collages and contact sheets drawn into one preallocated canvas
+
+        Every tile is decoded at reduced size, resized and copied straight
+        into its place in the canvas by a pool of workers, so nothing is
+        stacked or copied per row and the memory used is one canvas plus
+        a few tiles in flight.
+
+        Args:
+            max_workers: Tiles decoded at the same time
+            quality: JPEG quality of the result
+        """
+        self.max_workers = max_workers
+        self.quality = quality
+        self.last_timing = None
+
+    def _draw_tile(self, canvas, path, box, fit):
+        """Decode one image into its box on the canvas (worker thread)"""
+        x, y, w, h = box
+        image = read_reduced(path, (w, h))
+        if image is None:
+            print(f"ERROR: Could not load: {path}")
+            return False
+
+        if fit:
+            # Keep the aspect ratio, centered in the box
+            img_h, img_w = image.shape[:2]
+            scale = min(w / img_w, h / img_h)
+            size = (max(1, round(img_w * scale)), max(1, round(img_h * scale)))
+            x += (w - size[0]) // 2
+            y += (h - size[1]) // 2
+        else:
+            size = (w, h)
+
+        tile = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        canvas[y:y + size[1], x:x + size[0]] = tile
+        return True
+
+    def build(self, image_paths, output_path, layout, tile_size, gap=0, fit=False,
+              background=(255, 255, 255)):
+        """
+        Draw images into a grid and save it
+
+        Args:
+            image_paths: Images in reading order (left to right, top to bottom)
+            output_path: Where to save the collage
+            layout: Tuple (rows, cols)
+            tile_size: Tuple (width, height) of each tile
+            gap: Pixels between tiles and around the edge
+            fit: Keep each image's aspect ratio instead of stretching it
+            background: BGR color of the gaps
+        Returns: Path to collage or None
+        """
+        rows, cols = layout
+        tile_w, tile_h = tile_size
+        if not image_paths or rows < 1 or cols < 1:
+            return None
+
+        start = time.monotonic()
+        canvas = np.empty((rows * tile_h + (rows + 1) * gap,
+                           cols * tile_w + (cols + 1) * gap, 3), dtype=np.uint8)
+        canvas[:] = background
+
+        boxes = []
+        for i in range(min(len(image_paths), rows * cols)):
+            row, col = divmod(i, cols)
+            boxes.append((gap + col * (tile_w + gap), gap + row * (tile_h + gap), tile_w, tile_h))
+
+        # Tiles don't overlap, so workers can write into the canvas directly
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda job: self._draw_tile(canvas, job[0], job[1], fit),
+                                    zip(image_paths, boxes)))
+        drawn_at = time.monotonic()
+
+        if not any(results):
+            return None
+
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        cv2.imwrite(output_path, canvas, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        saved_at = time.monotonic()
+
+        self.last_timing = {
+            "tiles": sum(results),
+            "draw_ms": (drawn_at - start) * 1000,
+            "encode_ms": (saved_at - drawn_at) * 1000,
+            "total_ms": (saved_at - start) * 1000,
+        }
+        print(f"Collage saved: {output_path} ({self.last_timing['tiles']} tiles, "
+              f"{canvas.shape[1]}x{canvas.shape[0]}) in {self.last_timing['total_ms']:.0f} ms "
+              f"(tiles {self.last_timing['draw_ms']:.0f}, encode {self.last_timing['encode_ms']:.0f})")
+        return output_path
+
+    def contact_sheet(self, party_folder, output_path=None, columns=10, tile_width=240, gap=8,
+                      pattern="strip_*.jpg"):
+        """
+        One overview image of every strip of a party
+
+        Args:
+            party_folder: Folder with the party's strips
+            output_path: Where to save it (defaults to contact_sheet.jpg
+                in the party folder)
+            columns: Strips per row
+            tile_width: Width of each strip on the sheet
+            gap: Pixels between strips
+            pattern: Files to include
+        Returns: Path to contact sheet or None
+        """
+        paths = [p for p in glob.glob(os.path.join(party_folder, pattern))
+                 if not p.endswith("_print.jpg")]
+        if not paths:
+            print(f"No strips found in {party_folder}")
+            return None
+        paths.sort(key=strip_sort_key)
+
+        # Tile shape from the first strip (all strips share a template)
+        size = first_image_size(paths)
+        if size is None:
+            return None
+        width, height = size
+        tile_size = (tile_width, round(tile_width * height / width))
+
+        if output_path is None:
+            output_path = os.path.join(party_folder, "contact_sheet.jpg")
+
+        columns = min(columns, len(paths))
+        rows = math.ceil(len(paths) / columns)
+        return self.build(paths, output_path, (rows, columns), tile_size, gap=gap, fit=True)
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+# (name, longest side in pixels, quality), largest first. Each one is
+# downsampled from the one before it. "print" is the saved photo itself.
+DEFAULT_RENDITIONS = [
+    ("email", 800, 85),
+    ("review", 540, 85),
+    ("thumb", 270, 80),
+]
+
+CODEC_QUALITY_FLAGS = {
+    ".jpg": cv2.IMWRITE_JPEG_QUALITY,
+    ".webp": cv2.IMWRITE_WEBP_QUALITY,
+}
+
+
+class DerivativeBuilder:
+    def __init__(self, renditions=None, codec=".jpg", folder="renditions"):
+        """
+        Smaller copies of every photo, built once in the background
+
+        The photo is decoded (or taken from memory) once and shrunk step
+        by step, each rendition from the previous one, then encoded next
+        to the original in a renditions folder. Screens and the email
+        ask for the smallest rendition that still fills their size.
+
+        Args:
+            renditions: List of (name, longest side, quality), largest
+                first (defaults to DEFAULT_RENDITIONS)
+            codec: File extension of the encoder (".jpg" or ".webp")
+            folder: Sub folder of the photo's folder for the renditions
+        """
+        if codec not in CODEC_QUALITY_FLAGS:
+            raise ValueError(f"Unsupported rendition codec: {codec}")
+        self.renditions = sorted(renditions or DEFAULT_RENDITIONS, key=lambda r: -r[1])
+        self.codec = codec
+        self.folder = folder
+
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = {}  # filepath -> Future
+        self.lock = threading.Lock()
+
+        # Stats
+        self.photos_built = 0
+        self.total_build_ms = 0.0
+
+    def get_path(self, filepath, name):
+        """
+        Where a rendition of a photo is stored
+        (party/1_1.jpg, "thumb" -> party/renditions/1_1_thumb.jpg)
+        """
+        if name == "print":
+            return filepath
+        folder, filename = os.path.split(filepath)
+        stem = os.path.splitext(filename)[0]
+        return os.path.join(folder, self.folder, f"{stem}_{name}{self.codec}")
+
+    def submit(self, filepath, frame=None):
+        """
+        Queue building the renditions of a photo
+
+        Args:
+            filepath: Path of the full size photo
+            frame: The same photo in memory (BGR, not modified afterwards),
+                saves decoding the file
+        Returns: Future resolving to {name: path}
+        """
+        future = self.executor.submit(self._build, filepath, frame)
+        with self.lock:
+            self.pending[filepath] = future
+        future.add_done_callback(lambda f: self._done(filepath, f))
+        return future
+
+    def _done(self, filepath, future):
+        """Forget a finished build"""
+        with self.lock:
+            if self.pending.get(filepath) is future:
+                del self.pending[filepath]
+
+    def _build(self, filepath, frame):
+        """Decode once, shrink step by step, encode each rendition (worker thread)"""
+        start = time.monotonic()
+        if frame is None:
+            frame = cv2.imread(filepath)
+            if frame is None:
+                print(f"ERROR: Could not load photo for renditions: {filepath}")
+                return {}
+
+        os.makedirs(os.path.join(os.path.dirname(filepath), self.folder), exist_ok=True)
+        paths = {"print": filepath}
+        current = frame
+        for name, longest_side, quality in self.renditions:
+            h, w = current.shape[:2]
+            scale = longest_side / max(h, w)
+            if scale < 1:
+                size = (max(1, round(w * scale)), max(1, round(h * scale)))
+                current = cv2.resize(current, size, interpolation=cv2.INTER_AREA)
+
+            path = self.get_path(filepath, name)
+            ok, encoded = cv2.imencode(self.codec, current, [CODEC_QUALITY_FLAGS[self.codec], quality])
+            if not ok:
+                print(f"ERROR: Could not encode {name} rendition of {filepath}")
+                continue
+            # Renamed into place so a reader never sees half a file
+            temp_path = path + ".part"
+            with open(temp_path, "wb") as f:
+                f.write(encoded.tobytes())
+            os.replace(temp_path, path)
+            paths[name] = path
+
+        build_ms = (time.monotonic() - start) * 1000
+        self.photos_built += 1
+        self.total_build_ms += build_ms
+        print(f"Renditions built for {filepath} in {build_ms:.0f} ms")
+        return paths
+
+    def is_ready(self, filepath):
+        """Check that no renditions of a photo are still being built"""
+        with self.lock:
+            return filepath not in self.pending
+
+    def when_built(self, filepath, callback):
+        """
+        Call callback(filepath) once the renditions of a photo are built
+
+        The callback runs on the worker thread (or right away if the
+        build already finished), UI code has to hand it over to the UI
+        thread itself (e.g. with a signal).
+
+        Returns: False if nothing is being built for the photo (callback
+            not called)
+        """
+        with self.lock:
+            future = self.pending.get(filepath)
+        if future is None:
+            return False
+        future.add_done_callback(lambda f: callback(filepath))
+        return True
+
+    def wait(self, filepath, timeout=2.0):
+        """
+        Wait for the renditions of a photo if they are still being built
+        Returns: True if nothing is pending for it any more
+        """
+        with self.lock:
+            future = self.pending.get(filepath)
+        if future is None:
+            return True
+        if timeout <= 0:
+            return future.done()
+        try:
+            future.result(timeout=timeout)
+            return True
+        except Exception:
+            return future.done()
+
+    def pick(self, filepath, width, height, timeout=0):
+        """
+        Smallest rendition of a photo that still fills width x height
+
+        Args:
+            filepath: Path of the full size photo
+            width, height: Size it will be shown at
+            timeout: Seconds to wait for renditions still being built
+                (0: don't wait, use what is on disk)
+        Returns:
+            Path to the rendition, or the photo itself if none fits
+        """
+        self.wait(filepath, timeout)
+        needed = max(width, height)
+        for name, longest_side, _ in reversed(self.renditions):
+            if longest_side >= needed:
+                path = self.get_path(filepath, name)
+                if os.path.exists(path):
+                    return path
+        return filepath
+
+    def get_rendition(self, filepath, name, timeout=0):
+        """
+        Path of a named rendition, or the photo itself if it isn't there
+        (yet, unless timeout gives it time to be built)
+        """
+        self.wait(filepath, timeout)
+        path = self.get_path(filepath, name)
+        return path if os.path.exists(path) else filepath
+
+    def shutdown(self):
+        """
+        Finish the renditions still queued
+
+        The worker is replaced by a fresh one (its thread only starts on
+        the next submit), so the builder can be used again after.
+        """
+        self.executor.shutdown(wait=True)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def get_stats(self):
+        """
+        Get build counters
+        Returns: Dictionary with photos built, pending and average build time
+        """
+        with self.lock:
+            pending = len(self.pending)
+        return {
+            "photos_built": self.photos_built,
+            "pending": pending,
+            "avg_build_ms": self.total_build_ms / self.photos_built if self.photos_built else 0.0,
+        }
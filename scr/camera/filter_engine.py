@@ -0,0 +1,115 @@
+import time
+
+import cv2
+import numpy as np
+
+FILTER_NAMES = ["none", "grayscale", "sepia", "blur", "sharpen"]
+
+
+class FilterEngine:
+    def __init__(self, live_budget_ms=8.0):
+        """
+        Photo filters compiled once and reused for every frame
+
+        Color filters are a single cached 3x3 color matrix (one
+        cv2.transform pass, 3-channel in and out), blur and sharpen keep
+        their kernels. Every filter keeps the BGR 3-channel layout so the
+        result can go straight to the preview renderer or the JPEG writer.
+
+        Args:
+            live_budget_ms: Per-frame cost a filter must stay under at
+                preview size to be shown live
+        """
+        self.live_budget_ms = live_budget_ms
+        self.timings = {}  # (filter, width, height) -> [count, total_ms, max_ms]
+
+        # Color matrices in BGR order (rows = output B, G, R)
+        gray_row = [0.114, 0.587, 0.299]
+        self.color_matrices = {
+            "grayscale": np.array([gray_row, gray_row, gray_row], dtype=np.float32),
+            "sepia": np.array([[0.131, 0.534, 0.272],
+                               [0.168, 0.686, 0.349],
+                               [0.189, 0.769, 0.393]], dtype=np.float32),
+        }
+
+        # Convolution kernels
+        self.blur_kernel = cv2.getGaussianKernel(15, 0).astype(np.float32)
+        self.sharpen_kernel = np.array([[-1, -1, -1],
+                                        [-1, 9, -1],
+                                        [-1, -1, -1]], dtype=np.float32)
+
+    def apply(self, frame, filter_type="none", in_place=False):
+        """
+        Apply a filter to a BGR frame
+
+        Args:
+            frame: Input frame (numpy array, BGR)
+            filter_type: "none", "grayscale", "sepia", "blur", "sharpen"
+            in_place: Write the result into frame instead of a new array
+        Returns: Filtered BGR frame (frame itself if in_place)
+        """
+        if frame is None:
+            return None
+
+        start = time.perf_counter()
+        dst = frame if in_place else None
+
+        if filter_type in self.color_matrices:
+            result = cv2.transform(frame, self.color_matrices[filter_type], dst=dst)
+        elif filter_type == "blur":
+            result = cv2.sepFilter2D(frame, -1, self.blur_kernel, self.blur_kernel, dst=dst)
+        elif filter_type == "sharpen":
+            result = cv2.filter2D(frame, -1, self.sharpen_kernel, dst=dst)
+        else:  # "none"
+            return frame
+
+        self._record_time(filter_type, frame, (time.perf_counter() - start) * 1000)
+        return result
+
+    def _record_time(self, filter_type, frame, elapsed_ms):
+        """Keep per filter and frame size timing"""
+        h, w = frame.shape[:2]
+        key = (filter_type, w, h)
+        entry = self.timings.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+        entry[2] = max(entry[2], elapsed_ms)
+
+    def get_stats(self):
+        """
+        Get timing of every filter/size combination used so far
+        Returns: Dictionary of "filter WxH" -> {count, avg_ms, max_ms}
+        """
+        stats = {}
+        for (filter_type, w, h), (count, total_ms, max_ms) in self.timings.items():
+            stats[f"{filter_type} {w}x{h}"] = {
+                "count": count,
+                "avg_ms": total_ms / count,
+                "max_ms": max_ms,
+            }
+        return stats
+
+    def benchmark(self, sizes=((540, 540), (1080, 1080)), runs=10):
+        """
+        Time each filter on generated frames
+
+        Args:
+            sizes: (width, height) sizes to time, typically preview and full
+            runs: Frames per filter and size
+        Returns:
+            Dictionary of filter -> {"WxH": avg_ms, ..., "live": bool}
+        """
+        results = {}
+        for filter_type in FILTER_NAMES[1:]:
+            results[filter_type] = {}
+            for w, h in sizes:
+                frame = np.random.randint(0, 256, (h, w, 3), dtype=np.uint8)
+                start = time.perf_counter()
+                for _ in range(runs):
+                    self.apply(frame, filter_type, in_place=True)
+                results[filter_type][f"{w}x{h}"] = (time.perf_counter() - start) * 1000 / runs
+
+            # Safe to show live if it fits the budget at the first (preview) size
+            preview_w, preview_h = sizes[0]
+            results[filter_type]["live"] = results[filter_type][f"{preview_w}x{preview_h}"] <= self.live_budget_ms
+        return results
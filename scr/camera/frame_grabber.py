@@ -0,0 +1,205 @@
+import threading
+import time
+from collections import deque
+
+
+class FrameGrabber:
+    def __init__(self, read_frame, buffer_size=4):
+        """
+        Read frames on a background thread into a small ring buffer
+
+        Args:
+            read_frame: Callable returning (ret, frame), e.g. VideoCapture.read
+            buffer_size: Number of recent frames kept in the ring buffer
+        """
+        self.read_frame = read_frame
+        self.buffer = deque(maxlen=buffer_size)
+        self.lock = threading.Lock()
+        self.frame_ready = threading.Condition(self.lock)
+        self.thread = None
+        self.running = False
+
+        # Cleared while someone else needs the camera (e.g. a mode switch)
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+
+        # Counters (all guarded by self.lock)
+        self.frame_id = 0  # id of the newest frame grabbed
+        self.last_delivered_id = 0  # id of the newest frame handed to a consumer
+        self.frames_grabbed = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0  # grabbed but replaced before anyone read them
+        self.frames_repeated = 0  # same frame handed out more than once
+        self.read_failures = 0
+        self.last_read_ms = 0.0
+        self.last_age_ms = 0.0
+        self.avg_age_ms = 0.0
+        self.max_age_ms = 0.0
+        self.started_at = None
+
+    def start(self):
+        """Start the grabber thread"""
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self.thread.start()
+        print("Frame grabber started")
+
+    def stop(self):
+        """Stop the grabber thread and wait for it to exit"""
+        if not self.running:
+            return
+        self.running = False
+        self.resume_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        with self.lock:
+            self.frame_ready.notify_all()
+        print("Frame grabber stopped")
+
+    def _run(self):
+        """Grab frames until stopped"""
+        while self.running:
+            if not self.resume_event.wait(0.1):
+                continue
+
+            read_start = time.monotonic()
+            ret, frame = self.read_frame()
+            now = time.monotonic()
+
+            if not ret or frame is None:
+                with self.lock:
+                    self.read_failures += 1
+                # Don't spin on a camera that stopped delivering
+                time.sleep(0.01)
+                continue
+
+            with self.lock:
+                self.frame_id += 1
+                self.buffer.append((self.frame_id, now, frame))
+                self.frames_grabbed += 1
+                self.last_read_ms = (now - read_start) * 1000
+                self.frame_ready.notify_all()
+
+    def pause(self):
+        """Stop grabbing after the current read finishes"""
+        self.resume_event.clear()
+
+    def resume(self):
+        """Continue grabbing after pause()"""
+        self.resume_event.set()
+
+    def get_latest(self):
+        """
+        Get the newest frame without blocking
+
+        Returns:
+            Tuple (frame_id, timestamp, frame) or None if nothing grabbed yet
+        """
+        with self.lock:
+            if not self.buffer:
+                return None
+            entry = self.buffer[-1]
+            self._record_delivery(entry)
+            return entry
+
+    def wait_for_frame(self, after_id=None, timeout=1.0):
+        """
+        Block until a frame newer than after_id is available
+
+        Args:
+            after_id: Frame id to wait past (None = newest frame at call time)
+            timeout: Maximum seconds to wait
+        Returns:
+            Tuple (frame_id, timestamp, frame) or None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            if after_id is None:
+                after_id = self.frame_id
+            # clear() can empty the buffer between the notify and waking up
+            while self.frame_id <= after_id or not self.buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return None
+                self.frame_ready.wait(remaining)
+            entry = self.buffer[-1]
+            self._record_delivery(entry)
+            return entry
+
+    def _record_delivery(self, entry):
+        """Update drop/age counters for a frame handed to a consumer (lock held)"""
+        frame_id, timestamp, _ = entry
+
+        if frame_id == self.last_delivered_id:
+            self.frames_repeated += 1
+        elif frame_id > self.last_delivered_id:
+            if self.last_delivered_id > 0:
+                self.frames_dropped += frame_id - self.last_delivered_id - 1
+            self.last_delivered_id = frame_id
+
+        age_ms = (time.monotonic() - timestamp) * 1000
+        self.frames_delivered += 1
+        self.last_age_ms = age_ms
+        self.max_age_ms = max(self.max_age_ms, age_ms)
+        # Exponential moving average so the number follows the current load
+        if self.frames_delivered == 1:
+            self.avg_age_ms = age_ms
+        else:
+            self.avg_age_ms = self.avg_age_ms * 0.9 + age_ms * 0.1
+
+    def get_frames_since(self, since):
+        """
+        Get all buffered frames captured at or after a time
+
+        Frames returned here don't count as delivered in the stats.
+
+        Args:
+            since: time.monotonic() timestamp
+        Returns:
+            List of (frame_id, timestamp, frame), oldest first
+        """
+        with self.lock:
+            return [entry for entry in self.buffer if entry[1] >= since]
+
+    def clear(self):
+        """Drop all buffered frames (e.g. after the camera mode changed)"""
+        with self.lock:
+            self.buffer.clear()
+
+    def reset_stats(self):
+        """Reset the counters"""
+        with self.lock:
+            self.frames_grabbed = 0
+            self.frames_delivered = 0
+            self.frames_dropped = 0
+            self.frames_repeated = 0
+            self.read_failures = 0
+            self.avg_age_ms = 0.0
+            self.max_age_ms = 0.0
+            self.started_at = time.monotonic()
+
+    def get_stats(self):
+        """
+        Get grabber counters
+
+        Returns:
+            Dictionary with grab rate, dropped frames and frame age numbers
+        """
+        with self.lock:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0
+            return {
+                "frames_grabbed": self.frames_grabbed,
+                "frames_delivered": self.frames_delivered,
+                "frames_dropped": self.frames_dropped,
+                "frames_repeated": self.frames_repeated,
+                "read_failures": self.read_failures,
+                "grab_fps": self.frames_grabbed / elapsed if elapsed > 0 else 0.0,
+                "last_read_ms": self.last_read_ms,
+                "last_age_ms": self.last_age_ms,
+                "avg_age_ms": self.avg_age_ms,
+                "max_age_ms": self.max_age_ms,
+            }
@@ -0,0 +1,424 @@
+import csv
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """
+    Where CameraController gets its frames from
+
+    The methods mirror the part of cv2.VideoCapture the controller uses,
+    so a real camera, a generator and a recording are interchangeable.
+    """
+
+    def open(self):
+        """Open the source. Returns: True if frames can be read"""
+        raise NotImplementedError
+
+    def isOpened(self):
+        """Check if the source is open"""
+        raise NotImplementedError
+
+    def read(self):
+        """
+        Read the next frame
+        Returns: Tuple (ret, frame) like VideoCapture.read
+        """
+        raise NotImplementedError
+
+    def set(self, prop_id, value):
+        """Set a cv2.CAP_PROP_* property. Returns: True if accepted"""
+        return False
+
+    def get(self, prop_id):
+        """Get a cv2.CAP_PROP_* property (0 if unknown)"""
+        return 0
+
+    def release(self):
+        """Close the source"""
+        pass
+
+
+class OpenCVSource(FrameSource):
+    def __init__(self, camera_index=0):
+        """
+        Real camera through cv2.VideoCapture (V4L2 on Linux)
+
+        Args:
+            camera_index: Camera device index (0 or 1)
+        """
+        self.camera_index = camera_index
+        self.capture = None
+
+    def open(self):
+        if platform.system() == "Linux":
+            self.capture = cv2.VideoCapture(self.camera_index, cv2.CAP_V4L2)
+        else:
+            self.capture = cv2.VideoCapture(self.camera_index)
+        return self.capture.isOpened()
+
+    def isOpened(self):
+        return self.capture is not None and self.capture.isOpened()
+
+    def read(self):
+        return self.capture.read()
+
+    def set(self, prop_id, value):
+        return self.capture.set(prop_id, value)
+
+    def get(self, prop_id):
+        return self.capture.get(prop_id)
+
+    def release(self):
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+
+
+# Size of one bit of the frame counter block in the top-left corner
+COUNTER_BITS = 32
+COUNTER_CELL = 8
+
+
+def encode_frame_counter(frame, counter):
+    """
+    Draw a frame counter as black/white cells along the top-left edge
+
+    Args:
+        frame: BGR frame to draw into (modified in place)
+        counter: Integer to encode
+    """
+    for bit in range(COUNTER_BITS):
+        value = 255 if (counter >> bit) & 1 else 0
+        x = bit * COUNTER_CELL
+        frame[0:COUNTER_CELL, x:x + COUNTER_CELL] = value
+
+
+def decode_frame_counter(frame):
+    """
+    Read back a counter written by encode_frame_counter
+
+    Survives JPEG compression, so it also works on saved photos.
+    Returns: Integer counter
+    """
+    counter = 0
+    half = COUNTER_CELL // 2
+    for bit in range(COUNTER_BITS):
+        x = bit * COUNTER_CELL
+        if frame[half, x + half].mean() > 127:
+            counter |= 1 << bit
+    return counter
+
+
+class SyntheticSource(FrameSource):
+    def __init__(self, resolution=(1920, 1080), fps=30):
+        """
+        Generated frames for running without a camera
+
+        Each frame has a moving bar and the frame number, both as text
+        and as a counter block (see decode_frame_counter).
+
+        Args:
+            resolution: Tuple of (width, height)
+            fps: Frame rate read() is paced to (0 = as fast as possible)
+        """
+        self.resolution = resolution
+        self.fps = fps
+        self.props = {}
+        self.opened = False
+        self.frame_count = 0
+        self.next_frame_time = None
+        self.background = None
+
+    def open(self):
+        self.opened = True
+        self.frame_count = 0
+        self.next_frame_time = None
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def _make_background(self):
+        """Gradient background, rebuilt only when the resolution changes"""
+        width, height = self.resolution
+        x = np.linspace(0, 255, width, dtype=np.uint8)
+        y = np.linspace(0, 255, height, dtype=np.uint8)
+        background = np.empty((height, width, 3), dtype=np.uint8)
+        background[:, :, 0] = x[np.newaxis, :]
+        background[:, :, 1] = y[:, np.newaxis]
+        background[:, :, 2] = 128
+        self.background = background
+
+    def read(self):
+        if not self.opened:
+            return False, None
+
+        # Pace to the configured frame rate like a real sensor
+        if self.fps:
+            now = time.monotonic()
+            if self.next_frame_time is None:
+                self.next_frame_time = now
+            delay = self.next_frame_time - now
+            if delay > 0:
+                time.sleep(delay)
+            # Don't try to catch up after a stall, just like a camera drops frames
+            self.next_frame_time = max(self.next_frame_time, now) + 1.0 / self.fps
+
+        width, height = self.resolution
+        if self.background is None or self.background.shape[:2] != (height, width):
+            self._make_background()
+
+        self.frame_count += 1
+        frame = self.background.copy()
+
+        bar_x = (self.frame_count * 8) % width
+        frame[:, bar_x:bar_x + max(1, width // 40)] = 255
+
+        cv2.putText(frame, f"frame {self.frame_count}", (width // 10, height // 2),
+                    cv2.FONT_HERSHEY_SIMPLEX, height / 300, (255, 255, 255), max(1, height // 200))
+        encode_frame_counter(frame, self.frame_count)
+
+        return True, frame
+
+    def set(self, prop_id, value):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            self.resolution = (int(value), self.resolution[1])
+        elif prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            self.resolution = (self.resolution[0], int(value))
+        elif prop_id == cv2.CAP_PROP_FPS:
+            self.fps = value
+        else:
+            self.props[prop_id] = value
+        return True
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.resolution[0]
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.resolution[1]
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        return self.props.get(prop_id, 0)
+
+    def release(self):
+        self.opened = False
+
+
+# Index file written next to the recorded frames
+RECORDING_INDEX = "timestamps.csv"
+
+
+class RecordingSource(FrameSource):
+    def __init__(self, source, record_dir, quality=95):
+        """
+        Pass frames through from another source and save them to disk
+
+        Frames are written as numbered JPEGs with their capture time in
+        timestamps.csv, so ReplaySource can play the session back.
+
+        Args:
+            source: FrameSource to record from
+            record_dir: Folder for the recording
+            quality: JPEG quality of the saved frames
+        """
+        self.source = source
+        self.record_dir = record_dir
+        self.quality = quality
+        self.index_file = None
+        self.index_writer = None
+        self.start_time = None
+        self.frame_count = 0
+
+    def open(self):
+        if not self.source.open():
+            return False
+
+        os.makedirs(self.record_dir, exist_ok=True)
+        self.index_file = open(os.path.join(self.record_dir, RECORDING_INDEX), "w", newline="")
+        self.index_writer = csv.writer(self.index_file)
+        self.index_writer.writerow(["frame", "seconds", "filename"])
+        self.start_time = None
+        self.frame_count = 0
+        print(f"Recording camera to: {self.record_dir}")
+        return True
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def read(self):
+        ret, frame = self.source.read()
+        if not ret or self.index_writer is None:
+            return ret, frame
+
+        now = time.monotonic()
+        if self.start_time is None:
+            self.start_time = now
+
+        self.frame_count += 1
+        filename = f"{self.frame_count:06d}.jpg"
+        cv2.imwrite(os.path.join(self.record_dir, filename), frame,
+                    [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        self.index_writer.writerow([self.frame_count, f"{now - self.start_time:.6f}", filename])
+
+        return ret, frame
+
+    def set(self, prop_id, value):
+        return self.source.set(prop_id, value)
+
+    def get(self, prop_id):
+        return self.source.get(prop_id)
+
+    def release(self):
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+            self.index_writer = None
+            print(f"Recorded {self.frame_count} frames to: {self.record_dir}")
+        self.source.release()
+
+
+class ReplaySource(FrameSource):
+    def __init__(self, record_dir, loop=True, preload=False):
+        """
+        Play back a RecordingSource session at its original timing
+
+        Args:
+            record_dir: Folder written by RecordingSource
+            loop: Start over after the last frame
+            preload: Decode all frames into memory when opening, so replay
+                doesn't pay JPEG decode time per frame
+        """
+        self.record_dir = record_dir
+        self.loop = loop
+        self.preload = preload
+        self.entries = []  # (seconds, filename)
+        self.frames = {}
+        self.position = 0
+        self.start_time = None
+        self.opened = False
+        self.frame_size = (0, 0)
+        self.props = {}
+
+    def open(self):
+        index_path = os.path.join(self.record_dir, RECORDING_INDEX)
+        if not os.path.exists(index_path):
+            print(f"ERROR: No recording found at: {self.record_dir}")
+            return False
+
+        with open(index_path, newline="") as f:
+            reader = csv.DictReader(f)
+            self.entries = [(float(row["seconds"]), row["filename"]) for row in reader]
+
+        if not self.entries:
+            print(f"ERROR: Recording is empty: {self.record_dir}")
+            return False
+
+        if self.preload:
+            for _, filename in self.entries:
+                self.frames[filename] = cv2.imread(os.path.join(self.record_dir, filename))
+
+        first = self._load(self.entries[0][1])
+        if first is None:
+            return False
+        self.frame_size = (first.shape[1], first.shape[0])
+
+        self.position = 0
+        self.start_time = None
+        self.opened = True
+        print(f"Replaying {len(self.entries)} frames from: {self.record_dir}")
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def _load(self, filename):
+        """Get a recorded frame from memory or disk"""
+        if filename in self.frames:
+            return self.frames[filename]
+        return cv2.imread(os.path.join(self.record_dir, filename))
+
+    def read(self):
+        if not self.opened:
+            return False, None
+
+        if self.position >= len(self.entries):
+            if not self.loop:
+                return False, None
+            # Start the clock over for the next pass
+            self.position = 0
+            self.start_time = None
+
+        seconds, filename = self.entries[self.position]
+        now = time.monotonic()
+        if self.start_time is None:
+            self.start_time = now - seconds
+
+        # Wait until this frame's original capture time
+        delay = self.start_time + seconds - now
+        if delay > 0:
+            time.sleep(delay)
+
+        self.position += 1
+        frame = self._load(filename)
+        if frame is None:
+            return False, None
+        self.frame_size = (frame.shape[1], frame.shape[0])
+        return True, frame
+
+    def set(self, prop_id, value):
+        # A recording has a fixed size and rate
+        self.props[prop_id] = value
+        return False
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.frame_size[0]
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.frame_size[1]
+        return self.props.get(prop_id, 0)
+
+    def release(self):
+        self.opened = False
+        self.frames = {}
+
+
+def create_frame_source(spec=None, camera_index=0):
+    """
+    Build a frame source from a short description
+
+    Args:
+        spec: None or "camera" for the real camera, "synthetic" or
+            "synthetic:WIDTHxHEIGHT@FPS", "record:<folder>" to record the
+            real camera, "replay:<folder>" to play a recording back
+        camera_index: Camera device index for the real camera
+    Returns:
+        FrameSource
+    """
+    if not spec or spec == "camera":
+        return OpenCVSource(camera_index)
+
+    kind, _, arg = spec.partition(":")
+
+    if kind == "synthetic":
+        resolution, fps = (1920, 1080), 30
+        if arg:
+            size, _, rate = arg.partition("@")
+            width, height = size.lower().split("x")
+            resolution = (int(width), int(height))
+            if rate:
+                fps = float(rate)
+        return SyntheticSource(resolution=resolution, fps=fps)
+
+    if kind == "record" and arg:
+        return RecordingSource(OpenCVSource(camera_index), arg)
+
+    if kind == "replay" and arg:
+        return ReplaySource(arg)
+
+    print(f"Unknown camera source '{spec}', using the camera")
+    return OpenCVSource(camera_index)
@@ -0,0 +1,165 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+
+
+class PhotoWriter:
+    def __init__(self, max_pending=4, quality=95, fsync=True):
+        """
+        Encode and write JPEGs on a background thread
+
+        Files are written to a temporary name, flushed to disk and then
+        renamed, so a path only ever exists once its file is complete.
+
+        Args:
+            max_pending: Photos allowed to wait in the queue. submit()
+                blocks when the queue is full (storage is falling behind).
+            quality: Default JPEG quality
+            fsync: fsync each file before reporting it durable
+        """
+        self.quality = quality
+        self.fsync = fsync
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.pending = {}  # filepath -> Future
+        self.lock = threading.Lock()
+
+        # Stats
+        self.files_written = 0
+        self.files_failed = 0
+        self.backpressure_waits = 0
+        self.backpressure_ms = 0.0
+        self.last_result = None
+
+        self.thread = threading.Thread(target=self._run, name="PhotoWriter", daemon=True)
+        self.thread.start()
+
+    def submit(self, frame, filepath, quality=None):
+        """
+        Queue a frame to be written as a JPEG
+
+        The frame must not be modified after it is submitted.
+
+        Args:
+            frame: BGR numpy array
+            filepath: Destination path
+            quality: JPEG quality (None for the writer default)
+        Returns:
+            Future resolving to a dict with path and timings once the file
+            is on disk (exception if the write failed)
+        """
+        future = Future()
+        with self.lock:
+            self.pending[filepath] = future
+
+        submitted = time.monotonic()
+        self.queue.put((frame, filepath, quality or self.quality, future, submitted))
+
+        wait_ms = (time.monotonic() - submitted) * 1000
+        if wait_ms > 1:
+            self.backpressure_waits += 1
+            self.backpressure_ms += wait_ms
+            print(f"Photo writer queue full, waited {wait_ms:.0f} ms")
+
+        return future
+
+    def _run(self):
+        """Write queued photos until the process exits"""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, filepath, quality, future, submitted = item
+            try:
+                result = self._write(frame, filepath, quality, submitted)
+                self.files_written += 1
+                self.last_result = result
+                print(f"Photo written: {filepath} (queued {result['queue_ms']:.0f} ms, "
+                      f"encode {result['encode_ms']:.0f} ms, write {result['write_ms']:.0f} ms)")
+                future.set_result(result)
+            except Exception as e:
+                self.files_failed += 1
+                print(f"ERROR: Failed to write photo {filepath}: {e}")
+                future.set_exception(e)
+            finally:
+                with self.lock:
+                    if self.pending.get(filepath) is future:
+                        del self.pending[filepath]
+                self.queue.task_done()
+
+    def _write(self, frame, filepath, quality, submitted):
+        """Encode and durably write one photo"""
+        start = time.monotonic()
+
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise IOError("JPEG encode failed")
+        encoded_at = time.monotonic()
+
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        temp_path = filepath + ".part"
+        with open(temp_path, "wb") as f:
+            f.write(encoded.tobytes())
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+        written_at = time.monotonic()
+
+        return {
+            "path": filepath,
+            "bytes": len(encoded),
+            "queue_ms": (start - submitted) * 1000,
+            "encode_ms": (encoded_at - start) * 1000,
+            "write_ms": (written_at - encoded_at) * 1000,
+        }
+
+    def get_future(self, filepath):
+        """Future for a photo still being written, None if it's done or unknown"""
+        with self.lock:
+            return self.pending.get(filepath)
+
+    def wait_all(self, timeout=None):
+        """
+        Wait for every queued photo to be written
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+        Returns:
+            True if everything was written in time
+        """
+        with self.lock:
+            futures = list(self.pending.values())
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                if not future.done():
+                    return False
+        return True
+
+    def get_stats(self):
+        """
+        Get writer counters
+        Returns: Dictionary with file counts, queue depth and backpressure time
+        """
+        return {
+            "files_written": self.files_written,
+            "files_failed": self.files_failed,
+            "queue_depth": self.queue.qsize(),
+            "backpressure_waits": self.backpressure_waits,
+            "backpressure_ms": self.backpressure_ms,
+            "last_result": self.last_result,
+        }
+
+    def close(self):
+        """Finish the queued photos and stop the writer thread"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=10.0)
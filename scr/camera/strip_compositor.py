@@ -0,0 +1,303 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from camera.strip_layout import DEFAULT_LAYOUT, StripLayout, get_layout_path, load_layout_file
+
+
+class StripCompositor:
+    def __init__(self, template_cache, max_workers=3):
+        """
+        Builds photo strips from in-memory frames or photo files
+
+        Slot geometry comes from the layout file next to the template
+        (see strip_layout), compiled once per file version. Each photo is
+        resized once per distinct slot shape and pasted into every slot
+        of that shape. Photos given as paths are decoded in parallel.
+
+        Args:
+            template_cache: TemplateCache holding the resized templates
+            max_workers: Threads used to decode photos from disk
+        """
+        self.template_cache = template_cache
+        self.max_workers = max_workers
+        self.decode_pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Incremental builds run here one step at a time, in order
+        self.build_executor = ThreadPoolExecutor(max_workers=1)
+        self.last_timing = None
+
+        self.default_layout = StripLayout(DEFAULT_LAYOUT)
+        self.layouts = {}  # layout path -> (file key, StripLayout)
+        self.layout_lock = threading.Lock()
+
+    def get_layout(self, template_path):
+        """
+        Compiled layout for a template
+
+        Uses the .json file next to the template if there is one (and it
+        is valid), otherwise the default 3 photo double strip.
+
+        Args:
+            template_path: Path to template image
+        Returns: StripLayout
+        """
+        layout_path = get_layout_path(template_path)
+        try:
+            stat = os.stat(layout_path)
+        except OSError:
+            return self.default_layout
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self.layout_lock:
+            entry = self.layouts.get(layout_path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+
+        try:
+            layout = load_layout_file(layout_path)
+        except ValueError as e:
+            print(f"ERROR: {e} - using the default layout")
+            layout = self.default_layout
+        else:
+            print(f"Strip layout loaded: {layout}")
+
+        with self.layout_lock:
+            self.layouts[layout_path] = (key, layout)
+        return layout
+
+    def _load_photo(self, photo):
+        """
+        Get a BGR frame for a photo given as a frame or a path
+        Returns: numpy array or None
+        """
+        if isinstance(photo, np.ndarray):
+            return photo
+
+        if not os.path.exists(photo):
+            print(f"ERROR: Photo not found: {photo}")
+            return None
+        frame = cv2.imread(photo)
+        if frame is None:
+            print(f"ERROR: Could not load photo: {photo}")
+        return frame
+
+    def load_photos(self, photos):
+        """
+        Get BGR frames for a list of frames/paths, decoding files in parallel
+        Returns: List of numpy arrays (None where a photo couldn't be loaded)
+        """
+        return list(self.decode_pool.map(self._load_photo, photos))
+
+    def get_overlay(self, template_path, layout):
+        """
+        Cached overlay of a template if its layout draws it over the photos
+        Returns: TemplateOverlay or None
+        """
+        if not layout.overlay:
+            return None
+        return self.template_cache.get_overlay(template_path, layout.canvas_size, layout.background)
+
+    def new_canvas(self, template_path, layout):
+        """
+        Copy of the cached template to paste photos on
+        Returns: PIL RGB image or None
+        """
+        overlay = self.get_overlay(template_path, layout)
+        if overlay is not None:
+            template = overlay.base
+        else:
+            template = self.template_cache.get(template_path, layout.canvas_size)
+        if template is None:
+            return None
+        # The cached template stays clean
+        return template.copy()
+
+    def paste_photo(self, canvas, layout, index, frame, overlay=None):
+        """
+        Paste one photo into all of its slots
+
+        Args:
+            canvas: PIL image from new_canvas
+            layout: StripLayout of the strip
+            index: Photo number in the strip (0 based)
+            frame: BGR numpy array
+            overlay: TemplateOverlay to draw over the photo (overlay mode)
+        """
+        layout.paste(canvas, index, frame)
+        if overlay is not None:
+            for box in layout.boxes(index):
+                overlay.blend(canvas, box)
+
+    def save_strip(self, canvas, output_path, dpi=300):
+        """Save as high-quality JPEG"""
+        canvas.save(output_path, 'JPEG', quality=95, dpi=(dpi, dpi))
+
+    def shutdown(self):
+        """
+        Finish queued strip builds
+
+        The workers are replaced by fresh ones (threads only start on the
+        next submit), so the compositor can be used again after.
+        """
+        self.build_executor.shutdown(wait=True)
+        self.build_executor = ThreadPoolExecutor(max_workers=1)
+        self.decode_pool.shutdown(wait=True)
+        self.decode_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def begin_strip(self, template_path):
+        """
+        Start a strip that photos are added to as they are taken
+
+        Returns: StripBuild
+        """
+        return StripBuild(self, template_path)
+
+    def create_strip(self, photos, template_path, output_path, layout=None):
+        """
+        Create a photo strip using a template
+
+        Args:
+            photos: List of photos (as many as the layout has), each a
+                BGR frame or a file path
+            template_path: Path to template image
+            output_path: Where to save the final strip
+            layout: StripLayout to use instead of the template's own
+        Returns:
+            Path to saved strip or None
+        """
+        layout = layout or self.get_layout(template_path)
+        if len(photos) != layout.shot_count:
+            print(f"Need exactly {layout.shot_count} photos, got {len(photos)}")
+            return None
+
+        start = time.monotonic()
+
+        final_image = self.new_canvas(template_path, layout)
+        if final_image is None:
+            return None
+        overlay = self.get_overlay(template_path, layout)
+        template_at = time.monotonic()
+
+        frames = self.load_photos(photos)
+        decoded_at = time.monotonic()
+
+        for i, frame in enumerate(frames):
+            if frame is not None:
+                self.paste_photo(final_image, layout, i, frame, overlay)
+        composed_at = time.monotonic()
+
+        self.save_strip(final_image, output_path, layout.dpi)
+        saved_at = time.monotonic()
+
+        self.last_timing = {
+            "template_ms": (template_at - start) * 1000,
+            "decode_ms": (decoded_at - template_at) * 1000,
+            "compose_ms": (composed_at - decoded_at) * 1000,
+            "encode_ms": (saved_at - composed_at) * 1000,
+            "total_ms": (saved_at - start) * 1000,
+        }
+        print(f"Photo strip saved: {output_path} in {self.last_timing['total_ms']:.0f} ms "
+              f"(decode {self.last_timing['decode_ms']:.0f}, compose {self.last_timing['compose_ms']:.0f}, "
+              f"encode {self.last_timing['encode_ms']:.0f})")
+
+        return output_path
+
+
+class StripBuild:
+    def __init__(self, compositor, template_path):
+        """
+        A strip being put together one photo at a time
+
+        Every step runs on the compositor's build thread in the order it
+        was asked for, so pasting a photo happens while the next countdown
+        is running and only the JPEG encode is left for the end.
+
+        Args:
+            compositor: StripCompositor doing the work
+            template_path: Path to template image
+        """
+        self.compositor = compositor
+        self.executor = compositor.build_executor
+        self.layout = None
+        self.overlay = None
+        self.canvas = None
+        self.photo_count = 0
+        self.paste_ms = 0.0
+        self.executor.submit(self._prepare, template_path)
+
+    def _prepare(self, template_path):
+        """Look up the layout and copy the template (build thread)"""
+        self.layout = self.compositor.get_layout(template_path)
+        self.canvas = self.compositor.new_canvas(template_path, self.layout)
+        self.overlay = self.compositor.get_overlay(template_path, self.layout)
+
+    def add_photo(self, index, frame):
+        """
+        Queue a photo to be pasted into its slots
+
+        Args:
+            index: Photo number in the strip (0 based)
+            frame: BGR numpy array (not modified afterwards)
+        Returns: Future of the paste
+        """
+        return self.executor.submit(self._paste, index, frame)
+
+    def _paste(self, index, frame):
+        """Paste a photo (build thread)"""
+        if self.canvas is None or frame is None or index >= self.layout.shot_count:
+            return
+        start = time.monotonic()
+        self.compositor.paste_photo(self.canvas, self.layout, index, frame, self.overlay)
+        self.paste_ms += (time.monotonic() - start) * 1000
+        self.photo_count += 1
+
+    def finish_async(self, output_path, last_shutter_time=None):
+        """
+        Queue writing the strip once all queued photos are pasted
+
+        Args:
+            output_path: Where to save the strip
+            last_shutter_time: time.monotonic() of the last photo's shutter,
+                to report how long the guest waited for the strip
+        Returns: Future resolving to the path of the saved strip or None
+        """
+        return self.executor.submit(self._save, output_path, last_shutter_time)
+
+    def finish(self, output_path, last_shutter_time=None):
+        """
+        Write the strip once all queued photos are pasted (blocking)
+        Returns: Path to saved strip or None
+        """
+        return self.finish_async(output_path, last_shutter_time).result()
+
+    def _save(self, output_path, last_shutter_time):
+        """Encode and write the strip (build thread)"""
+        if self.canvas is None:
+            print("ERROR: Strip has no template")
+            return None
+        if self.photo_count != self.layout.shot_count:
+            print(f"Need exactly {self.layout.shot_count} photos, got {self.photo_count}")
+            return None
+
+        start = time.monotonic()
+        self.compositor.save_strip(self.canvas, output_path, self.layout.dpi)
+        saved_at = time.monotonic()
+
+        timing = {
+            "paste_ms": self.paste_ms,
+            "encode_ms": (saved_at - start) * 1000,
+        }
+        message = f"Photo strip saved: {output_path} (pasting {self.paste_ms:.0f} ms during session, encode {timing['encode_ms']:.0f} ms)"
+        if last_shutter_time is not None:
+            timing["after_shutter_ms"] = (saved_at - last_shutter_time) * 1000
+            message += f", on disk {timing['after_shutter_ms']:.0f} ms after last shutter"
+        self.compositor.last_timing = timing
+        print(message)
+
+        # Canvas isn't needed any more
+        self.canvas = None
+        return output_path
@@ -0,0 +1,191 @@
+import json
+import math
+import os
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from camera.template_cache import STRIP_SIZE
+
+# The classic booth strip: 3 photos, printed twice side by side on a 4x6
+DEFAULT_LAYOUT = {
+    "canvas": list(STRIP_SIZE),
+    "dpi": 300,
+    "slots": [
+        {"photo": 0, "x": 65, "y": 50, "width": 460, "height": 460},
+        {"photo": 1, "x": 65, "y": 540, "width": 460, "height": 460},
+        {"photo": 2, "x": 65, "y": 1030, "width": 460, "height": 460},
+    ],
+    # Each slot is pasted once per copy, moved by (dx, dy)
+    "copies": [[0, 0], [615, 0]],
+}
+
+
+def get_layout_path(template_path):
+    """
+    Layout file that goes with a template: same name, .json extension
+    (images/photo_strip_template.png -> images/photo_strip_template.json)
+    """
+    return os.path.splitext(template_path)[0] + ".json"
+
+
+class SlotRender:
+    def __init__(self, size, rotation=0.0):
+        """
+        One way a photo is rendered (size + rotation) and everywhere it goes
+
+        Args:
+            size: Tuple (width, height) the photo is resized to
+            rotation: Degrees counterclockwise
+        """
+        self.size = size
+        self.rotation = rotation
+        self.positions = []  # top left corners on the canvas
+        self.matrix = None
+        self.box_size = size
+        self.mask = None
+
+        if rotation % 360:
+            # Rotate around the center into a box big enough for the corners
+            w, h = size
+            angle = math.radians(rotation)
+            box_w = int(math.ceil(abs(w * math.cos(angle)) + abs(h * math.sin(angle))))
+            box_h = int(math.ceil(abs(w * math.sin(angle)) + abs(h * math.cos(angle))))
+            matrix = cv2.getRotationMatrix2D((w / 2, h / 2), rotation, 1.0)
+            matrix[0, 2] += (box_w - w) / 2
+            matrix[1, 2] += (box_h - h) / 2
+            self.matrix = matrix
+            self.box_size = (box_w, box_h)
+
+            # Only the rotated photo is pasted, not the empty corners
+            ones = np.full((h, w), 255, dtype=np.uint8)
+            self.mask = Image.fromarray(cv2.warpAffine(ones, matrix, self.box_size))
+
+    def render(self, frame):
+        """
+        Resize (and rotate) a BGR frame for this slot
+        Returns: PIL RGB image
+        """
+        # Area averaging is the high quality choice for shrinking
+        resized = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if self.matrix is not None:
+            resized = cv2.warpAffine(resized, self.matrix, self.box_size, flags=cv2.INTER_LINEAR)
+        return Image.fromarray(cv2.cvtColor(resized, cv2.COLOR_BGR2RGB))
+
+
+class StripLayout:
+    def __init__(self, spec, source="default"):
+        """
+        A strip layout compiled into paste operations
+
+        Slots that show the same photo at the same size and rotation (e.g.
+        the left and right copy of a strip) share one SlotRender, so each
+        photo is resized once per distinct slot shape however many times
+        it appears on the canvas.
+
+        Args:
+            spec: Layout dictionary (see DEFAULT_LAYOUT). Slots take
+                photo, x, y, width, height and optionally rotation
+                (degrees) and scale (photo size within the slot, centered).
+                With overlay set the template is drawn over the photos,
+                its transparent parts showing them (and background elsewhere)
+            source: Where the layout came from, for log messages
+        Raises:
+            ValueError: If the layout is not valid
+        """
+        self.source = source
+        try:
+            canvas_w, canvas_h = spec.get("canvas", STRIP_SIZE)
+            self.canvas_size = (int(canvas_w), int(canvas_h))
+            self.dpi = int(spec.get("dpi", 300))
+            copies = [(int(dx), int(dy)) for dx, dy in spec.get("copies", [[0, 0]])]
+            # Draw the template over the photos using its alpha channel
+            self.overlay = bool(spec.get("overlay", False))
+            self.background = tuple(int(c) for c in spec.get("background", (255, 255, 255)))
+            slots = spec["slots"]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid strip layout {source}: {e}")
+
+        if not slots:
+            raise ValueError(f"Strip layout {source} has no slots")
+
+        self.renders = {}  # photo index -> [SlotRender]
+        for number, slot in enumerate(slots):
+            try:
+                photo = int(slot.get("photo", number))
+                x, y = float(slot["x"]), float(slot["y"])
+                width, height = float(slot["width"]), float(slot["height"])
+                rotation = float(slot.get("rotation", 0))
+                scale = float(slot.get("scale", 1.0))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid slot {number} in strip layout {source}: {e}")
+            if photo < 0 or width <= 0 or height <= 0 or scale <= 0:
+                raise ValueError(f"Invalid slot {number} in strip layout {source}")
+
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            targets = self.renders.setdefault(photo, [])
+            target = next((t for t in targets if t.size == size and t.rotation == rotation), None)
+            if target is None:
+                target = SlotRender(size, rotation)
+                targets.append(target)
+
+            # Centered on the slot, whatever the scale and rotation
+            center_x = x + width / 2
+            center_y = y + height / 2
+            box_w, box_h = target.box_size
+            for dx, dy in copies:
+                target.positions.append((round(center_x + dx - box_w / 2),
+                                         round(center_y + dy - box_h / 2)))
+
+        self.shot_count = max(self.renders) + 1
+        missing = [i for i in range(self.shot_count) if i not in self.renders]
+        if missing:
+            raise ValueError(f"Strip layout {source} has no slot for photo(s) {missing}")
+
+    def paste(self, canvas, index, frame):
+        """
+        Paste one photo into all of its slots
+
+        Args:
+            canvas: PIL RGB image of canvas_size
+            index: Photo number in the strip (0 based)
+            frame: BGR numpy array
+        """
+        for target in self.renders.get(index, []):
+            image = target.render(frame)
+            for position in target.positions:
+                canvas.paste(image, position, target.mask)
+
+    def boxes(self, index):
+        """
+        Canvas regions a photo covers
+        Returns: List of (x0, y0, x1, y1)
+        """
+        boxes = []
+        for target in self.renders.get(index, []):
+            box_w, box_h = target.box_size
+            for x, y in target.positions:
+                boxes.append((x, y, x + box_w, y + box_h))
+        return boxes
+
+    def __repr__(self):
+        mode = ", overlay" if self.overlay else ""
+        return (f"StripLayout({self.source}, {self.shot_count} photos, "
+                f"{self.canvas_size[0]}x{self.canvas_size[1]} @ {self.dpi} dpi{mode})")
+
+
+def load_layout_file(layout_path):
+    """
+    Read and compile a layout file
+
+    Returns: StripLayout
+    Raises:
+        ValueError: If the file can't be read or the layout is not valid
+    """
+    try:
+        with open(layout_path) as f:
+            spec = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read strip layout {layout_path}: {e}")
+    return StripLayout(spec, source=layout_path)
@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# 4x6 photo at 300 DPI
+STRIP_SIZE = (1200, 1800)
+
+
+class TemplateCache:
+    def __init__(self):
+        """
+        Decoded, pre-resized strip templates kept in memory
+
+        Entries are keyed by path, modification time, file size and
+        target size, so a template is decoded and resampled once and only
+        loaded again when the file on disk changes.
+        """
+        self.entries = {}  # path -> (key, image)
+        self.overlays = {}  # path -> (key, TemplateOverlay)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _file_key(self, template_path, target_size):
+        """Key that changes whenever the template file changes"""
+        stat = os.stat(template_path)
+        return (stat.st_mtime_ns, stat.st_size, tuple(target_size))
+
+    def get(self, template_path, target_size=STRIP_SIZE):
+        """
+        Get a template ready to composite on
+
+        The returned image is shared, copy it before drawing on it.
+
+        Args:
+            template_path: Path to template image
+            target_size: Tuple (width, height) to resize to
+        Returns:
+            PIL RGB image, or None if the template can't be loaded
+        """
+        try:
+            key = self._file_key(template_path, target_size)
+        except OSError:
+            print(f"ERROR: Template not found at {template_path}")
+            return None
+
+        with self.lock:
+            entry = self.entries.get(template_path)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+        start = time.monotonic()
+        template = self._load(template_path, target_size, 'RGB')
+        if template is None:
+            return None
+
+        with self.lock:
+            self.entries[template_path] = (key, template)
+            self.misses += 1
+        print(f"Template cached in {(time.monotonic() - start) * 1000:.0f} ms: {template_path}")
+        return template
+
+    def _load(self, template_path, target_size, mode):
+        """
+        Decode a template and resize it to target_size
+        Returns: PIL image in the given mode, or None
+        """
+        try:
+            template = Image.open(template_path).convert(mode)
+            print(f"Template loaded, original size: {template.size}")
+            if template.size != tuple(target_size):
+                template = template.resize(target_size, Image.Resampling.LANCZOS)
+                print(f"Template resized to: {target_size}")
+        except Exception as e:
+            print(f"ERROR: Could not load template {template_path}: {e}")
+            return None
+        return template
+
+    def get_overlay(self, template_path, target_size=STRIP_SIZE, background=(255, 255, 255)):
+        """
+        Get a template for overlay mode, where it is drawn over the photos
+
+        Decoded with its alpha channel and cached like get(), so the
+        blend masks are only worked out once per template file.
+
+        Args:
+            template_path: Path to template image (PNG with transparency)
+            target_size: Tuple (width, height) to resize to
+            background: RGB color behind the transparent parts
+        Returns:
+            TemplateOverlay, or None if the template can't be loaded
+        """
+        try:
+            key = self._file_key(template_path, target_size) + (tuple(background),)
+        except OSError:
+            print(f"ERROR: Template not found at {template_path}")
+            return None
+
+        with self.lock:
+            entry = self.overlays.get(template_path)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+        start = time.monotonic()
+        template = self._load(template_path, target_size, 'RGBA')
+        if template is None:
+            return None
+        overlay = TemplateOverlay(template, background)
+
+        with self.lock:
+            self.overlays[template_path] = (key, overlay)
+            self.misses += 1
+        print(f"Template overlay cached in {(time.monotonic() - start) * 1000:.0f} ms: {template_path}")
+        return overlay
+
+    def warm(self, template_path, target_size=STRIP_SIZE):
+        """Load a template ahead of time (e.g. at party start)"""
+        return self.get(template_path, target_size) is not None
+
+    def clear(self):
+        """Forget all cached templates"""
+        with self.lock:
+            self.entries = {}
+            self.overlays = {}
+
+
+class TemplateOverlay:
+    def __init__(self, template, background=(255, 255, 255)):
+        """
+        A template with transparency, ready to be blended over photos
+
+        The blend weights of a region are computed the first time it is
+        used and kept, so blending a slot after the first strip is one
+        cv2.blendLinear call on the slot area only. Regions the template
+        doesn't cover at all are skipped.
+
+        Args:
+            template: PIL RGBA image at the strip size
+            background: RGB color behind the transparent parts
+        """
+        rgba = np.asarray(template)
+        self.rgb = rgba[:, :, :3]
+        self.alpha = rgba[:, :, 3]
+        self.size = template.size
+        self.regions = {}  # (x0, y0, x1, y1) -> (rgb, template weights, photo weights) or None
+
+        # Canvas to paste the photos on: the template over the background
+        self.base = Image.new('RGB', template.size, tuple(background))
+        self.base.paste(template, (0, 0), template)
+
+    def _region(self, box):
+        """Cached template pixels and blend weights for a box"""
+        if box not in self.regions:
+            x0, y0, x1, y1 = box
+            alpha = self.alpha[y0:y1, x0:x1]
+            if not alpha.any():
+                self.regions[box] = None
+            else:
+                weights = alpha.astype(np.float32) / 255
+                self.regions[box] = (
+                    np.ascontiguousarray(self.rgb[y0:y1, x0:x1]),
+                    weights,
+                    1.0 - weights,
+                )
+        return self.regions[box]
+
+    def blend(self, canvas, box):
+        """
+        Draw the template over a region of the canvas
+
+        Args:
+            canvas: PIL RGB image from base (after pasting photos)
+            box: (x0, y0, x1, y1) region, e.g. a slot
+        """
+        width, height = self.size
+        box = (max(0, box[0]), max(0, box[1]), min(width, box[2]), min(height, box[3]))
+        if box[0] >= box[2] or box[1] >= box[3]:
+            return
+        region = self._region(box)
+        if region is None:
+            return
+        rgb, template_weights, photo_weights = region
+        photo = np.asarray(canvas.crop(box))
+        blended = cv2.blendLinear(photo, rgb, photo_weights, template_weights)
+        canvas.paste(Image.fromarray(blended), box[:2])
@@ -17,8 +17,12 @@ from ui_functions.ask_to_print_screen_function import AskToPrintScreen
 
 
 from camera.camera_controller import CameraController
+from camera.camera_profile import PREVIEW_PROFILE, PREVIEW_PROFILE_SMALL, STILL_PROFILE
+from camera.frame_sources import create_frame_source
 from utilities.usb_manager import USBManager
 from utilities.printer_manager import PrinterManager
+from utilities.strip_tracker import StripTracker
+from utilities.transition_monitor import TransitionMonitor
 
 # Index for which screen: 
 # 0 : launch screen
@@ -36,6 +40,16 @@ class PhotoboothWindow(QMainWindow):
 
         self.color_scheme = 1 # track the color scheme 
 
+        self.template_path = None  # strip template for this party (see get_template_path)
+
+        # Live preview pacing (see PreviewGovernor)
+        self.preview_target_fps = 30
+        self.preview_cpu_budget = 0.5  # fraction of the UI thread the preview may use
+
+        # Photo session settings
+        self.shot_count = 3  # photos per session (set from the strip layout per party)
+        self.countdown_seconds = 5  # countdown before each photo
+
         # USB Manager
         self.usb_manager = USBManager()
 
@@ -43,10 +57,28 @@ class PhotoboothWindow(QMainWindow):
         self.has_internet = self.usb_manager.is_connected_to_internet()
         print(f"Internet connection: {'Yes' if self.has_internet else 'No'}")
 
-        # Initialize camera once
-        self.camera = CameraController(camera_index=0, resolution=(1920, 1080))
+        # Initialize camera once, frames are read on a background thread
+        # so the preview never blocks the UI on a USB read. The preview runs
+        # at a small profile and only switches to full HD for each photo.
+        # PHOTOBOOTH_CAMERA_SOURCE can swap the camera for a synthetic or
+        # recorded source (see create_frame_source) for headless testing.
+        camera_source = create_frame_source(os.getenv('PHOTOBOOTH_CAMERA_SOURCE'), camera_index=0)
+        self.camera = CameraController(
+            camera_index=0,
+            resolution=(1920, 1080),
+            use_grabber=True,
+            preview_profiles=[PREVIEW_PROFILE, PREVIEW_PROFILE_SMALL],
+            still_profile=STILL_PROFILE,
+            switch_budget_ms=500,
+            source=camera_source,
+            zero_shutter_lag=True,
+            async_writes=True
+        )
         self.camera.open_camera()
 
+        # Strips render in the background, screens wait on this for them
+        self.strip_tracker = StripTracker()
+
         # Initialize printer manager
         self.printer_manager = PrinterManager()
 
@@ -79,6 +111,11 @@ class PhotoboothWindow(QMainWindow):
         # initializing to the launch screen 
         self.stackedWidget.setCurrentIndex(0)
 
+        # Time from a tap to the next screen being painted, per screen pair
+        # (press F12 to print the histograms)
+        self.transition_monitor = TransitionMonitor(self, self.stackedWidget, screen_names=[
+            "launch", "home", "take_photo", "display", "ask_email", "send_email", "ask_print"])
+
         self.resize(1024,600) # setting the size of the screen 
         self.setMaximumSize(1024,600)
 
@@ -101,6 +138,21 @@ class PhotoboothWindow(QMainWindow):
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.close()
+        elif event.key() == Qt.Key_F12:
+            # Transition histograms, saved with the party's photos
+            party_folder = getattr(self, "party_folder", None)
+            path = os.path.join(party_folder, "transition_stats.json") if party_folder else None
+            self.transition_monitor.dump(path)
+
+    def closeEvent(self, event):
+        """Finish background camera work (photos, strips) before exiting"""
+        self.camera.close_camera()
+        self.printer_manager.shutdown()
+
+        # End of the night: one overview image of the party's strips
+        if getattr(self, "party_folder", None) and self.photo_session_counter > 1:
+            self.camera.create_contact_sheet(self.party_folder)
+        super().closeEvent(event)
 
     def create_party_folder(self, party_name, base_dir="photos"):
         """
@@ -161,14 +213,33 @@ class PhotoboothWindow(QMainWindow):
         self.party_folder = self.create_party_folder_smart(party_name)
         print(f"New party: {party_name}, folder: {self.party_folder}")
 
+        # Find the template once and have it decoded before the first strip
+        self.template_path = None
+        template_path = self.get_template_path(refresh=True)
+        layout = self.camera.get_strip_layout(template_path)
+        self.camera.template_cache.warm(template_path, layout.canvas_size)
+        # Overlay layouts also draw the template (RGBA) over the photos
+        self.camera.strip_compositor.get_overlay(template_path, layout)
+
+        # The template's layout decides how many photos a session takes
+        self.shot_count = layout.shot_count
+
 
-    def get_template_path(self):
+    def get_template_path(self, refresh=False):
         """
         Get template path - checks USB first, then uses default
         
+        The result is remembered for the party, so the USB template folder
+        is only scanned again when refresh is set or the file disappears.
+        
+        Args:
+            refresh: Scan the USB template folder again
         Returns:
             Path to template image
         """
+        if not refresh and self.template_path and os.path.exists(self.template_path):
+            return self.template_path
+
         # Default template path
         default_template = os.path.join(
             os.path.dirname(__file__),
@@ -180,10 +251,11 @@ class PhotoboothWindow(QMainWindow):
         
         if usb_template and os.path.exists(usb_template):
             print(f"Using USB template: {usb_template}")
-            return usb_template
+            self.template_path = usb_template
         else:
             print(f"Using default template: {default_template}")
-            return default_template
+            self.template_path = default_template
+        return self.template_path
         
     def check_internet_connection(self):
         """
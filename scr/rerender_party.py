@@ -0,0 +1,205 @@
+"""
+Re-create every strip of a party with another template
+
+    python rerender_party.py <party_folder> <template> [--layout file.json]
+                             [--workers N] [--restart]
+
+Each session's photos ({session}_{n}.jpg) are put into the new template
+and strip_{session}.jpg is replaced. Sessions are rendered in parallel
+by a process pool at low priority, so it can run next to the booth.
+Finished sessions are recorded in rerender_progress.json in the party
+folder: running the same command again after an interruption picks up
+where it stopped (--restart renders everything again).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
+from camera.template_cache import TemplateCache
+from camera.strip_compositor import StripCompositor
+from camera.strip_layout import get_layout_path, load_layout_file
+from utilities.printer_manager import get_print_path
+
+PROGRESS_FILE = "rerender_progress.json"
+PHOTO_PATTERN = re.compile(r"^(\d+)_(\d+)\.jpg$")
+
+# Set up once in each worker process
+_compositor = None
+_layout = None
+
+
+def _init_worker(layout_path):
+    """Worker process setup: low priority, own template cache and layout"""
+    global _compositor, _layout
+    try:
+        os.nice(10)  # the booth UI comes first
+    except (AttributeError, OSError):
+        pass
+    _compositor = StripCompositor(TemplateCache(), max_workers=1)
+    _layout = load_layout_file(layout_path) if layout_path else None
+
+
+def _render_session(session, photo_paths, template_path, strip_path):
+    """
+    Render one strip (worker process)
+    Returns: (session, success, milliseconds)
+    """
+    start = time.monotonic()
+    # Written next to the old strip and swapped in when complete
+    temp_path = strip_path + ".part"
+    result = _compositor.create_strip(photo_paths, template_path, temp_path, layout=_layout)
+    if result is None:
+        return session, False, (time.monotonic() - start) * 1000
+    os.replace(temp_path, strip_path)
+
+    # The print copy is of the old strip, it's made again at print time
+    print_path = get_print_path(strip_path)
+    if os.path.exists(print_path):
+        os.remove(print_path)
+    return session, True, (time.monotonic() - start) * 1000
+
+
+class PartyRerender:
+    def __init__(self, party_folder, template_path, layout_path=None, workers=None):
+        """
+        Re-render all strips of a party folder
+
+        Args:
+            party_folder: Folder with the {session}_{n}.jpg photos
+            template_path: New template image
+            layout_path: Layout file (defaults to the one next to the template)
+            workers: Worker processes (defaults to the number of cores)
+        """
+        self.party_folder = party_folder
+        self.template_path = template_path
+        self.layout_path = layout_path
+        self.workers = workers or os.cpu_count() or 1
+        self.progress_path = os.path.join(party_folder, PROGRESS_FILE)
+
+        if layout_path:
+            self.layout = load_layout_file(layout_path)
+        else:
+            self.layout = StripCompositor(TemplateCache()).get_layout(template_path)
+
+    def find_sessions(self):
+        """
+        Photos of every session in the party folder
+        Returns: Dictionary of session -> list of photo paths in shot order
+        """
+        sessions = {}
+        for filename in os.listdir(self.party_folder):
+            match = PHOTO_PATTERN.match(filename)
+            if match:
+                session, shot = int(match.group(1)), int(match.group(2))
+                sessions.setdefault(session, {})[shot] = os.path.join(self.party_folder, filename)
+        return {s: [shots[n] for n in sorted(shots)] for s, shots in sorted(sessions.items())}
+
+    def _job_key(self):
+        """Identifies the template/layout versions, progress is only reused for the same ones"""
+        key = []
+        for path in (self.template_path, self.layout_path or get_layout_path(self.template_path)):
+            try:
+                stat = os.stat(path)
+                key.append([os.path.abspath(path), stat.st_mtime_ns, stat.st_size])
+            except OSError:
+                key.append([os.path.abspath(path), None, None])
+        return key
+
+    def load_progress(self):
+        """Sessions already done for this template/layout"""
+        try:
+            with open(self.progress_path) as f:
+                progress = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if progress.get("job") != self._job_key():
+            return set()
+        return set(progress.get("done", []))
+
+    def save_progress(self, done):
+        """Record finished sessions (written atomically)"""
+        temp_path = self.progress_path + ".part"
+        with open(temp_path, "w") as f:
+            json.dump({"job": self._job_key(), "done": sorted(done)}, f)
+        os.replace(temp_path, self.progress_path)
+
+    def run(self, restart=False, on_progress=None):
+        """
+        Render every session not done yet
+
+        Args:
+            restart: Ignore earlier progress
+            on_progress: Called with (completed, total, session, success)
+        Returns: Dictionary with rendered, failed, skipped counts and seconds
+        """
+        start = time.monotonic()
+        sessions = self.find_sessions()
+        done = set() if restart else self.load_progress()
+
+        jobs = []
+        skipped = 0
+        for session, photos in sessions.items():
+            if session in done:
+                continue
+            if len(photos) != self.layout.shot_count:
+                print(f"Session {session}: {len(photos)} photos, layout needs "
+                      f"{self.layout.shot_count} - skipped")
+                skipped += 1
+                continue
+            strip_path = os.path.join(self.party_folder, f"strip_{session}.jpg")
+            jobs.append((session, photos, strip_path))
+
+        print(f"Re-rendering {len(jobs)} strips with {self.workers} workers "
+              f"({len(done)} already done, {skipped} skipped)")
+
+        rendered = failed = 0
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.layout_path,)) as pool:
+            futures = [pool.submit(_render_session, session, photos, self.template_path, strip_path)
+                       for session, photos, strip_path in jobs]
+            for completed, future in enumerate(as_completed(futures), 1):
+                try:
+                    session, success, elapsed_ms = future.result()
+                except Exception as e:
+                    print(f"ERROR: Strip render failed: {e}")
+                    failed += 1
+                    continue
+
+                if success:
+                    rendered += 1
+                    done.add(session)
+                    self.save_progress(done)
+                else:
+                    failed += 1
+                print(f"[{completed}/{len(jobs)}] strip_{session}.jpg "
+                      f"{'done' if success else 'FAILED'} in {elapsed_ms:.0f} ms")
+                if on_progress:
+                    on_progress(completed, len(jobs), session, success)
+
+        seconds = time.monotonic() - start
+        print(f"Re-render finished: {rendered} rendered, {failed} failed, {skipped} skipped "
+              f"in {seconds:.1f} s ({rendered / seconds if seconds else 0:.1f} strips/s)")
+        return {"rendered": rendered, "failed": failed, "skipped": skipped, "seconds": seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-create every strip of a party with another template")
+    parser.add_argument("party_folder", help="Party folder with the session photos")
+    parser.add_argument("template", help="Template image to use")
+    parser.add_argument("--layout", help="Layout file (default: the .json next to the template)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: number of cores)")
+    parser.add_argument("--restart", action="store_true", help="Render every strip again, ignoring progress")
+    args = parser.parse_args()
+
+    rerender = PartyRerender(args.party_folder, args.template, args.layout, args.workers)
+    result = rerender.run(restart=args.restart)
+    return 0 if result["failed"] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
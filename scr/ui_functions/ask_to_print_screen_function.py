@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -13,14 +14,13 @@ class AskToPrintScreen(QtWidgets.QWidget, Ui_Ask_Print):
         self.main_window = main_window
         
         self.strip_path = None  # ADD THIS
+        self.print_tap_time = None
 
         self.design_setup()
         self.connect_signals()
 
     def design_setup(self):
         utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
 
     def connect_signals(self):
         self.pushButton_yes.clicked.connect(self.go_to_print)
@@ -36,21 +36,33 @@ class AskToPrintScreen(QtWidgets.QWidget, Ui_Ask_Print):
         super().showEvent(event)
         
         # Re-apply color scheme
-        utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
+        with self.main_window.transition_monitor.section("styling"):
+            utils_screen.apply_theme(self.main_window.color_scheme)
         
         # If no printer connected, skip straight to home
-        if not self.main_window.printer_manager.is_printer_connected():
+        with self.main_window.transition_monitor.section("printer"):
+            printer_connected = self.main_window.printer_manager.is_printer_connected()
+        if not printer_connected:
             print("No printer connected - skipping print screen")
             QtCore.QTimer.singleShot(0, self.go_to_home)
             return
         
+        # Render the print copy while the guest decides
+        if self.strip_path:
+            strip_path = self.strip_path
+            self.main_window.strip_tracker.when_ready(
+                strip_path, lambda ready: self.prepare_print_file(strip_path, ready))
+        
         # Printer is connected - show screen normally
         self.pushButton_yes.setEnabled(True)
         self.pushButton_yes.setText("Yes, print it!")
         self.label_main.setText("Would you like to print\nyour photo strip?")
 
+    def prepare_print_file(self, strip_path, strip_ready):
+        """Strip is finished - start its print copy in the background"""
+        if strip_ready:
+            self.main_window.printer_manager.prepare_print_file(strip_path)
+
     def go_to_print(self):
         """User wants to print"""
         if not self.strip_path:
@@ -58,14 +70,28 @@ class AskToPrintScreen(QtWidgets.QWidget, Ui_Ask_Print):
             self.go_to_home()
             return
         
+        # Time from here to the job being accepted is logged by the printer manager
+        self.print_tap_time = time.monotonic()
+        
         # Show printing message and hide buttons
         self.label_main.setText("Your photos are printing!")
         self.pushButton_yes.hide()
         self.pushButton_no.hide()
         QtWidgets.QApplication.processEvents()
         
-        # Send print job
-        success = self.main_window.printer_manager.print_photo_strip(self.strip_path)
+        # Print as soon as the strip is written (usually already is)
+        self.main_window.strip_tracker.when_ready(self.strip_path, self.print_when_ready)
+
+    def print_when_ready(self, strip_ready):
+        """Strip is finished - send the print job"""
+        if strip_ready:
+            success = self.main_window.printer_manager.print_photo_strip(
+                self.strip_path,
+                tap_time=self.print_tap_time
+            )
+        else:
+            print(f"ERROR: Photo strip not found at: {self.strip_path}")
+            success = False
         
         if success:
             # Wait 30 seconds then go home
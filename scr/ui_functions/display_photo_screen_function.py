@@ -1,13 +1,17 @@
 import sys
 import os
-from PyQt5 import QtCore, QtGui, QtWidgets
-import cv2
+from PyQt5 import QtCore, QtWidgets
+import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utilities import utils_screen
+from utilities.pixmap_cache import PixmapCache
 from ui_screens.display_photo import Ui_Display_Images
 
 class DisplayPhotoScreen(QtWidgets.QWidget, Ui_Display_Images):
+    # Carries a photo path from the rendition worker to the UI thread
+    _rendition_built = QtCore.pyqtSignal(str)
+
     def __init__(self, main_window, parent=None):
         super().__init__(parent)
         self.setupUi(self)
@@ -15,14 +19,16 @@ class DisplayPhotoScreen(QtWidgets.QWidget, Ui_Display_Images):
         
         self.photo_paths = []
         
+        # Photos scaled for the labels, so retakes and revisits are instant
+        self.pixmap_cache = PixmapCache(max_entries=24)
+        self._rendition_built.connect(self.rendition_built)
+        
         # Setup design and connect buttons
         self.design_setup()
         self.connect_signals()
 
     def design_setup(self):
         utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
 
         
         # Make labels display images properly
@@ -34,61 +40,70 @@ class DisplayPhotoScreen(QtWidgets.QWidget, Ui_Display_Images):
     def showEvent(self, event):
         super().showEvent(event)
         # Apply the chosen color scheme
-        utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
-        utils_screen.style_all_line_edits(self, self.main_window.color_scheme)
+        with self.main_window.transition_monitor.section("styling"):
+            utils_screen.apply_theme(self.main_window.color_scheme)
 
     def connect_signals(self):
         self.pushButton_to_print.clicked.connect(self.go_to_email_question)
         self.pushButton_retake.clicked.connect(self.retake_photos)
 
-    def set_photos(self, photo_paths):
-        """Set the photos to display"""
+    def get_photo_labels(self):
+        return [self.label_image_1, self.label_image_2, self.label_image_3]
+
+    def set_photos(self, photo_paths, frames=None):
+        """
+        Set the photos to display
+        
+        Args:
+            photo_paths: Photo files
+            frames: The same photos in memory, shown while their files and
+                renditions are still being written
+        """
         self.photo_paths = photo_paths
+        start = time.monotonic()
+        hits = self.pixmap_cache.hits
         
         # Display each photo
-        if len(photo_paths) >= 1:
-            self.display_photo(photo_paths[0], self.label_image_1)
-        
-        if len(photo_paths) >= 2:
-            self.display_photo(photo_paths[1], self.label_image_2)
-        
-        if len(photo_paths) >= 3:
-            self.display_photo(photo_paths[2], self.label_image_3)
+        for i, (photo_path, label) in enumerate(zip(photo_paths, self.get_photo_labels())):
+            frame = frames[i] if frames and i < len(frames) else None
+            self.display_photo(photo_path, label, frame)
+
+        print(f"Display photos loaded in {(time.monotonic() - start) * 1000:.0f} ms "
+              f"({self.pixmap_cache.hits - hits} from cache)")
 
-    def display_photo(self, photo_path, label):
-        """Load and display a photo in a label"""
-        frame = cv2.imread(photo_path)
+    def display_photo(self, photo_path, label, frame=None):
+        """Load and display a photo in a label (never waits for files being written)"""
+        size = (label.width(), label.height())
+        derivatives = self.main_window.camera.derivatives
+        
+        if frame is not None and derivatives.when_built(photo_path, self._rendition_built.emit):
+            # Renditions still being built: show the photo from memory,
+            # rendition_built swaps in the file version when it's done
+            pixmap = self.pixmap_cache.from_frame(frame, size)
+        else:
+            # Smallest rendition that fills the label instead of the full photo,
+            # decoded at a reduced scale and kept for the next time
+            path = derivatives.pick(photo_path, size[0], size[1])
+            pixmap = self.pixmap_cache.get(path, size)
         
-        if frame is None:
+        if pixmap is None:
             print(f"Failed to load: {photo_path}")
             return
         
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Get label size
-        label_width = label.width()
-        label_height = label.height()
-        
-        # Resize to fit label (square images fit into square labels)
-        resized = cv2.resize(rgb_frame, (label_width, label_height))
-        
-        # Convert to QImage
-        h, w, ch = resized.shape
-        bytes_per_line = ch * w
-        qt_image = QtGui.QImage(resized.data, w, h, bytes_per_line, 
-                                QtGui.QImage.Format_RGB888)
-        
-        # Convert to QPixmap and display
-        pixmap = QtGui.QPixmap.fromImage(qt_image)
         label.setPixmap(pixmap)
 
+    def rendition_built(self, photo_path):
+        """Renditions of a photo are on disk (UI thread) - show them from the cache"""
+        labels = self.get_photo_labels()
+        if photo_path in self.photo_paths[:len(labels)]:
+            self.display_photo(photo_path, labels[self.photo_paths.index(photo_path)])
+
     def go_to_email_question(self):
         """Go to ask email screen or skip to home if no internet"""
         # Check internet connection
-        if self.main_window.check_internet_connection():
+        with self.main_window.transition_monitor.section("internet"):
+            has_internet = self.main_window.check_internet_connection()
+        if has_internet:
         
             # Has internet - ask about email
             # Pass photos to email screen
@@ -113,13 +128,15 @@ class DisplayPhotoScreen(QtWidgets.QWidget, Ui_Display_Images):
         )
         
         print(f"DEBUG: Strip path: {strip_path}")
-        print(f"DEBUG: Strip exists: {os.path.exists(strip_path)}")
+        print(f"DEBUG: Strip ready: {self.main_window.strip_tracker.is_ready(strip_path)}")
         
         # ALWAYS set the strip path
         self.main_window.ask_to_print_screen.set_strip(strip_path)
         
         # Check if printer is connected
-        if self.main_window.printer_manager.is_printer_connected():
+        with self.main_window.transition_monitor.section("printer"):
+            printer_connected = self.main_window.printer_manager.is_printer_connected()
+        if printer_connected:
             print("No internet but printer connected - going to print screen")
             self.parentWidget().setCurrentIndex(6)  # Go to print screen
         else:
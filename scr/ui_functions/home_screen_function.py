@@ -19,8 +19,6 @@ class HomeScreen(QtWidgets.QWidget, Ui_Home):
 
     def design_setup(self):
         utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
         
 
     def connect_signals(self):
@@ -33,11 +31,11 @@ class HomeScreen(QtWidgets.QWidget, Ui_Home):
     def showEvent(self, event):
         """Update color scheme and USB status when screen appears"""
         super().showEvent(event)
-        # Re-apply color scheme in case it changed
-        utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
-        self.check_usb_status()
+        # Re-apply color scheme in case it changed (no-op if it didn't)
+        with self.main_window.transition_monitor.section("styling"):
+            utils_screen.apply_theme(self.main_window.color_scheme)
+        with self.main_window.transition_monitor.section("usb"):
+            self.check_usb_status()
 
     def check_usb_status(self):
         """Check and display USB connection status"""
@@ -41,17 +41,11 @@ class LaunchScreen(QtWidgets.QWidget, Ui_Launch):
 
     def apply_color_scheme(self):
         """Apply current color scheme to all elements"""
-        # Set background
+        # Set background and theme the whole app (one stylesheet per scheme)
         utils_screen.set_background(self.background, self.current_color)
         
-        # Style all buttons
-        utils_screen.style_all_buttons(self, self.current_color)
-        
-        # Style all labels
-        utils_screen.style_all_labels(self, self.current_color)
-        
-        # Style line edit
-        utils_screen.style_all_line_edits(self, self.current_color)
+        # New scheme, start without the error highlight
+        utils_screen.set_theme_state(self.lineEdit_party, "")
         
         # Save color choice to main window
         self.main_window.color_scheme = self.current_color
@@ -90,17 +84,11 @@ class LaunchScreen(QtWidgets.QWidget, Ui_Launch):
             self.label_test.setText(error_message)
             
             # Highlight the line edit in red
-            self.lineEdit_party.setStyleSheet("""
-                QLineEdit {
-                    border: 4px solid red;
-                    border-radius: 15px;
-                    padding: 10px;
-                    background-color: white;
-                    color: red;
-                }
-            """)
+            utils_screen.set_theme_state(self.lineEdit_party, "error")
             return
         
+        utils_screen.set_theme_state(self.lineEdit_party, "")
+        
         # Set party name and color in main window
         self.main_window.set_new_party(party_name)
         print(f"Party name set to: {party_name}")
@@ -25,9 +25,6 @@ class SendEmailScreen(QtWidgets.QWidget, Ui_Send_Email):
 
     def design_setup(self):
         utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
-        utils_screen.style_all_line_edits(self, self.main_window.color_scheme)
         
         # Set placeholder text for email input
         self.lineEdit_email.setPlaceholderText("your.email@example.com")
@@ -41,10 +38,8 @@ class SendEmailScreen(QtWidgets.QWidget, Ui_Send_Email):
     def showEvent(self, event):
         super().showEvent(event)
         # Apply the chosen color scheme
-        utils_screen.set_background(self.background, self.main_window.color_scheme)
-        utils_screen.style_all_buttons(self, self.main_window.color_scheme)
-        utils_screen.style_all_labels(self, self.main_window.color_scheme)
-        utils_screen.style_all_line_edits(self, self.main_window.color_scheme)
+        with self.main_window.transition_monitor.section("styling"):
+            utils_screen.apply_theme(self.main_window.color_scheme)
 
         self.lineEdit_email.setFocus()
 
@@ -110,11 +105,21 @@ class SendEmailScreen(QtWidgets.QWidget, Ui_Send_Email):
         # Show sending screen
         self.show_sending_screen("Sending...")
         
-        # Force UI to update
-        QtWidgets.QApplication.processEvents()
-        
-        # Send email
-        success = self.send_photos_via_email(email)
+        # Send as soon as the strip is written (usually already is)
+        self.main_window.strip_tracker.when_ready(
+            self.photo_strip_path,
+            lambda ready: self.send_when_ready(email, ready)
+        )
+
+    def send_when_ready(self, email, strip_ready):
+        """Strip is finished - send the email"""
+        if not strip_ready:
+            print(f"ERROR: Photo strip not found at: {self.photo_strip_path}")
+            success = False
+        else:
+            # Force UI to update
+            QtWidgets.QApplication.processEvents()
+            success = self.send_photos_via_email(email)
         
         if success:
             self.show_sending_screen("Email sent! ✓")
@@ -137,25 +142,23 @@ class SendEmailScreen(QtWidgets.QWidget, Ui_Send_Email):
         print(f"Sending photos to: {recipient_email}")
         print(f"Photo strip: {self.photo_strip_path}")
         
-        # Check if strip exists
-        if not self.photo_strip_path or not os.path.exists(self.photo_strip_path):
+        # Check if strip exists (waits if it's still being written)
+        if not self.main_window.strip_tracker.wait(self.photo_strip_path, timeout=10.0):
             print(f"ERROR: Photo strip not found at: {self.photo_strip_path}")
-            
-            # Wait a bit and check again (strip might still be creating)
-            import time
-            time.sleep(1)
-            
-            if not os.path.exists(self.photo_strip_path):
-                print("ERROR: Still no photo strip after waiting")
-                return False
+            return False
         
         print(f"Email address: {self.email_sender.email_address}")
         
+        # Email sized copies of the photos, not the full size originals
+        # (no waiting - a photo whose copy isn't built yet is sent as is)
+        derivatives = self.main_window.camera.derivatives
+        email_photos = [derivatives.get_rendition(path, "email") for path in self.captured_photos]
+        
         # Send the email using EmailSender
         success = self.email_sender.send_photo_strip(
             recipient_email=recipient_email,
             photo_strip_path=self.photo_strip_path,
-            individual_photos=self.captured_photos
+            individual_photos=email_photos
         )
         
         return success
@@ -1,11 +1,15 @@
 import sys
 import os  
-from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utilities import utils_screen
 from camera.camera_controller import CameraController
+from utilities.preview_renderer import PreviewRenderer
+from utilities.preview_governor import PreviewGovernor
+from utilities.session_engine import PhotoSessionEngine
+from utilities.preview_widget import PreviewWidget
 from ui_screens.take_photo import Ui_TakePhoto
 
 class TakePhotoScreen(QtWidgets.QWidget, Ui_TakePhoto):
@@ -14,52 +18,72 @@ class TakePhotoScreen(QtWidgets.QWidget, Ui_TakePhoto):
         self.setupUi(self)
         self.main_window = main_window
         self.camera = camera
+
+        # Crops/mirrors/converts preview frames into reused buffers
+        self.preview_renderer = PreviewRenderer(mirror=True)
+
+        # Widens/narrows the preview timer interval to fit the CPU budget
+        self.preview_governor = PreviewGovernor(
+            target_fps=main_window.preview_target_fps,
+            cpu_budget=main_window.preview_cpu_budget
+        )
         
         # Timer for camera preview updates
-        self.preview_timer = QtCore.QTimer()
+        self.preview_timer = QtCore.QTimer(self)
         self.preview_timer.timeout.connect(self.update_preview)
         
-        # Timer for countdown
-        self.countdown_timer = QtCore.QTimer()
-        self.countdown_timer.timeout.connect(self.countdown_tick)
+        # Countdown/capture timing for each session
+        self.session_engine = PhotoSessionEngine(
+            shot_count=main_window.shot_count,
+            countdown_seconds=main_window.countdown_seconds,
+            shutter_delay_ms=200,
+            review_ms=500,
+            on_countdown=self.countdown_tick,
+            on_shutter=self.shutter,
+            on_capture=self.capture_photo,
+            on_review_done=self.next_photo,
+            on_finished=self.session_finished,
+            parent=self
+        )
         
-        self.countdown_value = 3
         self.is_taking_photos = False
         self.show_preview = False
+        self.preview_active = False  # between start_preview and stop_preview (incl. reviews)
         self.current_photo_number = 0
         self.session_number = 0
         self.captured_photos = []
+        self.captured_frames = []  # same photos in memory, for the strip
+        self.strip_build = None  # strip being pasted together during the session
+        self.shutter_time = None
         
         self.design_setup()
 
     def design_setup(self):
         utils_screen.set_background(self.background, self.main_window.color_scheme)
         
-        # Make camera label display images properly
-        self.label_camera.setScaledContents(True)
+        # The preview is painted by its own widget in place of label_camera:
+        # frames are rendered at its size and drawn without a QPixmap
+        self.preview_widget = PreviewWidget(self)
+        self.preview_widget.setGeometry(self.label_camera.geometry())
+        self.label_camera.hide()
         
-        # Style countdown labels
-        color_scheme = utils_screen.get_color_scheme(self.main_window.color_scheme)
-        countdown_style = f"""
-            QLabel {{
-                color: {color_scheme['text']};
-                background-color: transparent;
-            }}
-        """
-        self.label_countdown.setStyleSheet(countdown_style)
-        self.label_countdown_2.setStyleSheet(countdown_style)
-        
-        # Initially hide countdown
+        # The countdown is drawn over the preview in the same paint,
+        # the designer's countdown labels aren't used
         self.label_countdown.hide()
         self.label_countdown_2.hide()
 
     def showEvent(self, event):
         """Called when screen becomes visible - start preview and auto start session"""
         super().showEvent(event)
-        utils_screen.set_background(self.background, self.main_window.color_scheme)
+        with self.main_window.transition_monitor.section("styling"):
+            utils_screen.apply_theme(self.main_window.color_scheme)
+            # The countdown is painted, not styled, give it the scheme's text color
+            color_scheme = utils_screen.get_color_scheme(self.main_window.color_scheme)
+            self.preview_widget.set_overlay_color(color_scheme['text'])
         
         # Start camera preview
-        self.start_preview()
+        with self.main_window.transition_monitor.section("preview"):
+            self.start_preview()
         
         # Auto start photo session
         if not self.is_taking_photos:
@@ -69,179 +93,189 @@ class TakePhotoScreen(QtWidgets.QWidget, Ui_TakePhoto):
         """Called when screen is hidden"""
         super().hideEvent(event)
         self.stop_preview()
-        self.countdown_timer.stop()
+        if self.session_engine.is_running():
+            # Left mid-session, start fresh next time
+            self.session_engine.cancel()
+            self.is_taking_photos = False
 
     def start_preview(self):
         """Start showing live camera preview"""
         if self.camera.is_open:
             self.show_preview = True
-            self.preview_timer.start(30)
+            self.preview_active = True
+            self.camera.reset_grabber_stats()
+            self.preview_renderer.reset_stats()
+            self.preview_widget.reset_stats()
+            self.preview_governor.reset()
+            self.preview_timer.start(int(self.preview_governor.interval_ms))
 
     def stop_preview(self):
         """Stop camera preview"""
+        was_running = self.preview_active
         self.show_preview = False
+        self.preview_active = False
         self.preview_timer.stop()
+        if was_running:
+            self.print_preview_stats()
+
+    def get_preview_stats(self):
+        """
+        Current preview rate and budget use for the operator
+        Returns: Dictionary from PreviewGovernor.get_stats
+        """
+        return self.preview_governor.get_stats()
+
+    def print_preview_stats(self):
+        """Print whether the grabber, renderer, widget and governor kept up with the preview"""
+        governor = self.get_preview_stats()
+        print(f"Preview rate: {governor['fps']:.1f}/{governor['target_fps']} fps, "
+              f"interval {governor['interval_ms']:.0f} ms, "
+              f"budget used {governor['budget_used'] * 100:.0f}% of {governor['cpu_budget'] * 100:.0f}%, "
+              f"{governor['frames_dropped']} ticks dropped")
+
+        stats = self.camera.get_grabber_stats()
+        if stats:
+            print(f"Preview grabber: {stats['grab_fps']:.1f} fps grabbed, "
+                  f"{stats['frames_dropped']} dropped, {stats['frames_repeated']} repeated, "
+                  f"frame age avg {stats['avg_age_ms']:.0f} ms / max {stats['max_age_ms']:.0f} ms")
+
+        render = self.preview_renderer.get_stats()
+        if render['frames_rendered']:
+            print(f"Preview render: avg {render['avg_ms']:.1f} ms / max {render['max_ms']:.1f} ms, "
+                  f"{render['frames_over_target']}/{render['frames_rendered']} over "
+                  f"{render['target_ms']:.0f} ms target")
+
+        paint = self.preview_widget.get_stats()
+        if paint['paints']:
+            print(f"Preview paint: avg {paint['avg_paint_ms']:.1f} ms / max {paint['max_paint_ms']:.1f} ms, "
+                  f"{paint['frames_painted']}/{paint['frames_set']} frames painted, "
+                  f"{paint['frames_dropped']} replaced before paint")
 
     def update_preview(self):
         """Update camera label with live feed"""
-        if not self.show_preview:
+        if not self.preview_governor.start_tick():
             return
         
         frame = self.camera.get_frame()
         if frame is not None:
-            self.display_frame(frame, self.label_camera)
-
-    def display_frame(self, frame, label):
-        """Convert OpenCV frame to QPixmap and display in label"""
-        import cv2
-        
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        h, w, ch = rgb_frame.shape
-        
-        # Crop to square
-        if w > h:
-            crop_size = h
-            start_x = (w - crop_size) // 2
-            cropped = rgb_frame[0:crop_size, start_x:start_x+crop_size]
-        else:
-            crop_size = w
-            start_y = (h - crop_size) // 2
-            cropped = rgb_frame[start_y:start_y+crop_size, 0:crop_size]
-        
-        label_width = label.width()
-        label_height = label.height()
-        display_size = min(label_width, label_height)
-        
-        resized = cv2.resize(cropped, (display_size, display_size))
-        
-        bytes_per_line = ch * display_size
-        qt_image = QtGui.QImage(resized.data, display_size, display_size,
-                                bytes_per_line, QtGui.QImage.Format_RGB888)
-        
-        pixmap = QtGui.QPixmap.fromImage(qt_image)
-        label.setPixmap(pixmap)
+            self.display_frame(frame, self.preview_widget)
 
+        # Adjust the timer to how long this frame took
+        interval = self.preview_governor.end_tick()
+        if interval != self.preview_timer.interval():
+            self.preview_timer.setInterval(interval)
 
     def start_photo_session(self):
-        """Start a 3-photo session"""
+        """Start a photo session (shot count from the main window)"""
         if self.is_taking_photos:
             return
         
         self.is_taking_photos = True
         self.current_photo_number = 1
         self.captured_photos = []
+        self.captured_frames = []
         
         self.session_number = self.main_window.photo_session_counter
         self.main_window.photo_session_counter += 1
-        
-        self.start_countdown()
 
-    def start_countdown(self):
-        """Start countdown for current photo"""
-        self.countdown_value = 5
-        
-        self.label_countdown.show()
-        self.label_countdown_2.show()
-        self.label_countdown.setText(str(self.countdown_value))
-        self.label_countdown_2.setText(str(self.countdown_value))
-        
-        self.countdown_timer.start(1000)
+        # Photos are pasted into the strip as they are taken
+        self.strip_build = self.camera.begin_photo_strip(self.main_window.get_template_path())
 
-    def countdown_tick(self):
-        """Handle countdown timer tick"""
-        self.countdown_value -= 1
-        
-        if self.countdown_value > 0:
-            self.label_countdown.setText(str(self.countdown_value))
-            self.label_countdown_2.setText(str(self.countdown_value))
-        else:
-            self.countdown_timer.stop()
-            self.label_countdown.setText("📸")
-            self.label_countdown_2.setText("📸")
-            QtCore.QTimer.singleShot(200, self.capture_photo)
+        # Pick up setting changes made since the last session
+        self.session_engine.shot_count = self.main_window.shot_count
+        self.session_engine.countdown_seconds = self.main_window.countdown_seconds
+        self.session_engine.start()
+
+    def countdown_tick(self, shot, value):
+        """Show a countdown number"""
+        self.preview_widget.set_overlay_text(str(value))
+
+        # Start buffering full resolution frames for zero shutter lag
+        if value == 1:
+            self.camera.prepare_still()
 
-    def capture_photo(self):
-        """Capture one photo in the session"""
+    def shutter(self, shot, shutter_time):
+        """Countdown reached zero"""
+        self.shutter_time = shutter_time
+        self.preview_widget.set_overlay_text("📸")
+
+    def capture_photo(self, shot, shutter_time):
+        """
+        Capture one photo in the session
+        Returns: True if the photo was captured
+        """
+        capture_start = time.monotonic()
+        self.current_photo_number = shot
         filename = f"{self.session_number}_{self.current_photo_number}"
         
-        photo_path = self.camera.take_photo(
+        photo_path, frame = self.camera.take_photo(
             save_dir=self.main_window.party_folder,
-            filename=filename
+            filename=filename,
+            shutter_time=shutter_time
         )
         
         if photo_path:
+            # Show captured photo briefly, straight from memory
+            captured_at = time.monotonic()
+            # The timer is stopped during the review, not left ticking
+            self.show_preview = False
+            self.preview_timer.stop()
+            self.preview_widget.set_overlay_text("")
+            self.display_captured_photo(frame)
+            shown_at = time.monotonic()
+            print(f"Photo {self.current_photo_number} review shown {(shown_at - capture_start) * 1000:.0f} ms "
+                  f"after capture started (render {(shown_at - captured_at) * 1000:.1f} ms, "
+                  f"frame interval {self.preview_governor.interval_ms:.0f} ms)")
+
             self.captured_photos.append(photo_path)
+            self.captured_frames.append(frame)
+
+            # Pasted on the build thread while the next countdown runs
+            if self.strip_build is not None:
+                self.strip_build.add_photo(shot - 1, frame)
             print(f"Photo {self.current_photo_number} captured: {photo_path}")
-            
-            # Show captured photo briefly
-            self.show_preview = False
-            self.display_captured_photo(photo_path)
-            
-            self.label_countdown.hide()
-            self.label_countdown_2.hide()
-            
-            if self.current_photo_number < 3:
-                # Resume preview and move to next photo
-                QtCore.QTimer.singleShot(500, self.next_photo)
-            else:
-                # All done - go to display screen
-                self.finish_session()
-        else:
-            print(f"Failed to capture photo {self.current_photo_number}")
-            self.finish_session()
 
-    def next_photo(self):
-        """Prepare for next photo"""
-        self.current_photo_number += 1
-        self.show_preview = True  # Resume preview
-        self.start_countdown()
+            info = self.camera.last_capture_info
+            if info:
+                score = f"{info['score']:.1f}" if info['score'] is not None else "n/a"
+                print(f"Photo {self.current_photo_number} capture lag {info['lag_ms']:+.0f} ms, sharpness {score}")
+            return True
 
-    def display_frame(self, frame, label):
-        """Convert OpenCV frame to QPixmap and display in label"""
-        import cv2
-        
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Flip horizontally so preview mirrors the user
-        rgb_frame = cv2.flip(rgb_frame, 1)
-        
-        h, w, ch = rgb_frame.shape
-        
-        # Crop to square
-        if w > h:
-            crop_size = h
-            start_x = (w - crop_size) // 2
-            cropped = rgb_frame[0:crop_size, start_x:start_x+crop_size]
-        else:
-            crop_size = w
-            start_y = (h - crop_size) // 2
-            cropped = rgb_frame[start_y:start_y+crop_size, 0:crop_size]
-        
-        label_width = label.width()
-        label_height = label.height()
-        display_size = min(label_width, label_height)
-        
-        resized = cv2.resize(cropped, (display_size, display_size))
-        
-        bytes_per_line = ch * display_size
-        qt_image = QtGui.QImage(resized.data, display_size, display_size,
-                                bytes_per_line, QtGui.QImage.Format_RGB888)
+        print(f"Failed to capture photo {self.current_photo_number}")
+        return False
+
+    def next_photo(self, shot):
+        """Prepare for next photo"""
+        self.current_photo_number = shot
         
-        pixmap = QtGui.QPixmap.fromImage(qt_image)
-        label.setPixmap(pixmap)
+        # Resume preview, the review pause isn't a dropped frame
+        self.show_preview = True
+        self.preview_governor.resume()
+        self.preview_timer.start(int(self.preview_governor.interval_ms))
+
+    def session_finished(self, success):
+        """Session engine is done (all photos taken or a capture failed)"""
+        self.finish_session()
+
+    def display_frame(self, frame, widget):
+        """Render an OpenCV frame as a mirrored square and hand it to the preview widget"""
+        display_size = min(widget.width(), widget.height())
+        qt_image = self.preview_renderer.render(frame, display_size)
+        widget.set_frame(qt_image)
 
     def finish_session(self):
         """Finish photo session and go to display screen"""
+        # The guest is waiting from here, not from the screen switch
+        self.main_window.transition_monitor.begin()
         self.is_taking_photos = False
         self.stop_preview()
         
-        self.label_countdown.hide()
-        self.label_countdown_2.hide()
+        self.preview_widget.set_overlay_text("")
         
         # Create photo strip in background
-        if len(self.captured_photos) == 3:
+        if len(self.captured_photos) == self.session_engine.shot_count:
             self.create_photo_strip_background()
+        self.strip_build = None
         
         self.strip_path = os.path.join(
             self.main_window.party_folder,
@@ -252,7 +286,7 @@ class TakePhotoScreen(QtWidgets.QWidget, Ui_TakePhoto):
         self.go_to_display_screen()
 
     def create_photo_strip_background(self):
-        """Create the photo strip collage in background"""
+        """Create the photo strip collage on the strip build thread (doesn't block)"""
         template_path = self.main_window.get_template_path()
         
         strip_filename = f"strip_{self.session_number}.jpg"
@@ -261,27 +295,37 @@ class TakePhotoScreen(QtWidgets.QWidget, Ui_TakePhoto):
             strip_filename
         )
         
-        result = self.camera.create_photo_strip(
-            self.captured_photos,
-            template_path,
-            strip_path
-        )
-        
-        if result:
-            print(f"Photo strip created: {result}")
+        if self.strip_build is not None:
+            # Photos are already pasted, only the encode is left
+            future = self.strip_build.finish_async(strip_path, last_shutter_time=self.shutter_time)
+            self.strip_build = None
         else:
-            print("Failed to create photo strip")
+            # Built from the frames in memory, the files may still be writing
+            future = self.camera.strip_compositor.build_executor.submit(
+                self.camera.create_photo_strip,
+                list(self.captured_photos),
+                template_path,
+                strip_path,
+                list(self.captured_frames)
+            )
+
+        # Email/print screens wait on this instead of polling for the file
+        self.main_window.strip_tracker.track(strip_path, future)
 
     def go_to_display_screen(self):
         """Navigate to display screen with photos"""
-        if len(self.captured_photos) == 3:
+        if len(self.captured_photos) == self.session_engine.shot_count:
+            # Shown from the frames in memory while files are still being written
             display_screen = self.main_window.display_photo_screen
-            display_screen.set_photos(self.captured_photos)
+            display_screen.set_photos(self.captured_photos, self.captured_frames)
             self.parentWidget().setCurrentIndex(3)
 
-    def display_captured_photo(self, photo_path):
-        """Display a captured photo in the camera label"""
-        import cv2
-        frame = cv2.imread(photo_path)
+    def display_captured_photo(self, frame):
+        """
+        Display a captured photo in the camera label
+        
+        Rendered from the frame take_photo returned at preview size, so it
+        doesn't wait for the file to be written.
+        """
         if frame is not None:
-            self.display_frame(frame, self.label_camera)
\ No newline at end of file
+            self.display_frame(frame, self.preview_widget)
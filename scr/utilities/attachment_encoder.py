@@ -0,0 +1,187 @@
+import os
+import time
+from collections import OrderedDict
+
+import cv2
+
+# Base64 makes every attachment a third bigger on the wire
+BASE64_FACTOR = 4 / 3
+# Headers and boundaries per attachment (generous)
+PART_OVERHEAD = 1024
+
+
+class AttachmentEncoder:
+    def __init__(self, budget_bytes=2_000_000, photo_share=0.4, min_quality=40, max_quality=95,
+                 scales=(1.0, 0.8, 0.6, 0.45), cache_size=4):
+        """
+        Fits email attachments under a size budget
+
+        Attachments are sent as they are when they all fit. Otherwise each
+        one that is over its share is re-encoded from a cached decode, bisecting the JPEG quality (and
+        stepping the scale down only if the lowest quality doesn't fit).
+        The photos share a fixed part of the budget, the strip gets all
+        that is left so it stays at the highest quality that fits.
+
+        Args:
+            budget_bytes: Maximum size of all attachments on the wire
+                (after base64)
+            photo_share: Part of the budget the individual photos may use
+            min_quality / max_quality: JPEG quality search range
+            scales: Scales tried in order when quality alone isn't enough
+            cache_size: Decoded images kept while fitting one email
+                (dropped after each encode)
+        """
+        self.budget_bytes = budget_bytes
+        self.photo_share = photo_share
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.scales = scales
+        self.cache_size = cache_size
+        self.decoded = OrderedDict()  # (path, mtime_ns) -> {scale: BGR image}
+        self.last_result = None
+
+    def _raw_budget(self, wire_bytes, parts):
+        """File bytes that fit in wire_bytes once base64 encoded"""
+        return max(0, int(wire_bytes / BASE64_FACTOR) - PART_OVERHEAD * parts)
+
+    def _decode(self, path, scale):
+        """Decoded (and scaled) image, cached per file version"""
+        key = (path, os.stat(path).st_mtime_ns)
+        scaled = self.decoded.get(key)
+        if scaled is None:
+            image = cv2.imread(path)
+            if image is None:
+                return None
+            scaled = {1.0: image}
+            self.decoded[key] = scaled
+            while len(self.decoded) > self.cache_size:
+                self.decoded.popitem(last=False)
+        self.decoded.move_to_end(key)
+
+        if scale not in scaled:
+            full = scaled[1.0]
+            h, w = full.shape[:2]
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            scaled[scale] = cv2.resize(full, size, interpolation=cv2.INTER_AREA)
+        return scaled[scale]
+
+    def _encode(self, image, quality):
+        ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return encoded.tobytes() if ok else None
+
+    def fit(self, path, max_bytes):
+        """
+        Bytes of one attachment, no bigger than max_bytes if possible
+
+        Args:
+            path: Image file
+            max_bytes: File size allowed
+        Returns:
+            (data, quality, scale) - quality/scale None if the file is
+            sent unchanged. data is None if it can't be read.
+        """
+        if os.path.getsize(path) <= max_bytes:
+            with open(path, 'rb') as f:
+                return f.read(), None, None
+
+        best = None
+        for scale in self.scales:
+            image = self._decode(path, scale)
+            if image is None:
+                return None, None, None
+
+            # Highest quality that fits at this scale
+            low, high = self.min_quality, self.max_quality
+            while low <= high:
+                quality = (low + high) // 2
+                data = self._encode(image, quality)
+                if data is not None and len(data) <= max_bytes:
+                    best = (data, quality, scale)
+                    low = quality + 1
+                else:
+                    high = quality - 1
+            if best is not None:
+                return best
+
+        # Nothing fits, send the smallest we have
+        image = self._decode(path, self.scales[-1])
+        return self._encode(image, self.min_quality), self.min_quality, self.scales[-1]
+
+    def clear(self):
+        """Drop the cached decodes"""
+        self.decoded.clear()
+
+    def encode(self, strip_path, photo_paths=()):
+        """
+        Fit a strip and its photos into the budget
+
+        Args:
+            strip_path: Photo strip (kept at the best quality possible)
+            photo_paths: Individual photos
+        Returns:
+            (strip_data, [photo_data, ...]) - one photo entry per path in
+            photo_paths, None for photos that are missing or unreadable
+        """
+        start = time.monotonic()
+        all_paths = list(photo_paths)
+        photo_paths = [p for p in all_paths if os.path.exists(p)]
+        original_bytes = os.path.getsize(strip_path) + sum(os.path.getsize(p) for p in photo_paths)
+        parts = 1 + len(photo_paths)
+
+        if original_bytes <= self._raw_budget(self.budget_bytes, parts):
+            # Everything fits, send the files as they are
+            strip_data, photo_data = self._read(strip_path), [self._read(p) for p in photo_paths]
+            self._report(original_bytes, original_bytes, start, None, None)
+        else:
+            try:
+                strip_data, photo_data = self._fit_all(strip_path, photo_paths, original_bytes, parts, start)
+            finally:
+                # Full size decodes are big, don't keep them between emails
+                self.clear()
+
+        # Back in the caller's order, with a gap for each missing photo
+        data_by_path = dict(zip(photo_paths, photo_data))
+        return strip_data, [data_by_path.get(p) for p in all_paths]
+
+    def _read(self, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _fit_all(self, strip_path, photo_paths, original_bytes, parts, start):
+        """Fit photos into their share and the strip into what is left"""
+        photo_data = []
+        photo_bytes = 0
+        if photo_paths:
+            share = self._raw_budget(self.budget_bytes * self.photo_share, len(photo_paths))
+            per_photo = share // len(photo_paths)
+            for path in photo_paths:
+                data, quality, scale = self.fit(path, per_photo)
+                photo_data.append(data)
+                photo_bytes += len(data) if data else 0
+
+        # The strip gets whatever the photos left
+        strip_budget = self._raw_budget(self.budget_bytes, parts) - photo_bytes
+        strip_data, strip_quality, strip_scale = self.fit(strip_path, strip_budget)
+
+        total_bytes = photo_bytes + (len(strip_data) if strip_data else 0)
+        self._report(original_bytes, total_bytes, start, strip_quality, strip_scale)
+        return strip_data, photo_data
+
+    def _report(self, original_bytes, total_bytes, start, strip_quality, strip_scale):
+        """Record and log what an encode saved"""
+        encode_ms = (time.monotonic() - start) * 1000
+        self.last_result = {
+            "original_bytes": original_bytes,
+            "sent_bytes": total_bytes,
+            "saved_bytes": original_bytes - total_bytes,
+            "encode_ms": encode_ms,
+            "strip_quality": strip_quality,
+            "strip_scale": strip_scale,
+        }
+        strip_note = "unchanged" if strip_quality is None else f"q{strip_quality} at {strip_scale:.0%}"
+        print(f"Email attachments: {original_bytes / 1024:.0f} KB -> {total_bytes / 1024:.0f} KB "
+              f"(saved {self.last_result['saved_bytes'] / 1024:.0f} KB, strip {strip_note}) "
+              f"in {encode_ms:.0f} ms")
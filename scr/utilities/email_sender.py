@@ -4,6 +4,8 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
 
+from utilities.attachment_encoder import AttachmentEncoder
+
 class EmailSender:
     def __init__(self):
         # Get credentials from environment variables
@@ -11,6 +13,19 @@ class EmailSender:
         self.email_password = os.getenv('PHOTOBOOTH_PASSWORD')
         self.smtp_server = "smtp.gmail.com"
         self.smtp_port = 587
+
+        # Attachments are shrunk to fit this (venue Wi-Fi / phone hotspots)
+        budget_kb = 2000
+        budget_setting = os.getenv('PHOTOBOOTH_EMAIL_BUDGET_KB')
+        if budget_setting:
+            try:
+                budget_kb = int(budget_setting)
+                if budget_kb <= 0:
+                    raise ValueError
+            except ValueError:
+                print(f"WARNING: Invalid PHOTOBOOTH_EMAIL_BUDGET_KB '{budget_setting}', using 2000")
+                budget_kb = 2000
+        self.attachment_encoder = AttachmentEncoder(budget_bytes=budget_kb * 1024)
         
         # Check if credentials are set
         if not self.email_address or not self.email_password:
@@ -54,28 +69,34 @@ This is an automated email from Capture The Foto - CTF photobooth.
             
             msg.attach(MIMEText(body, 'plain'))
             
-            # Attach photo strip
-            if photo_strip_path and os.path.exists(photo_strip_path):
-                with open(photo_strip_path, 'rb') as f:
-                    img = MIMEImage(f.read())
-                    img.add_header('Content-Disposition', 'attachment', 
-                                   filename='photobooth_strip.jpg')
-                    msg.attach(img)
-                print(f"Attached photo strip: {photo_strip_path}")
-            else:
+            if not photo_strip_path or not os.path.exists(photo_strip_path):
                 print(f"Photo strip not found: {photo_strip_path}")
                 return False
             
-            # Optionally attach individual photos
-            if individual_photos:
-                for i, photo_path in enumerate(individual_photos):
-                    if os.path.exists(photo_path):
-                        with open(photo_path, 'rb') as f:
-                            img = MIMEImage(f.read())
-                            img.add_header('Content-Disposition', 'attachment',
-                                          filename=f'photo_{i+1}.jpg')
-                            msg.attach(img)
-                        print(f"Attached photo {i+1}: {photo_path}")
+            # Fit everything under the size budget, strip at the best quality
+            strip_data, photo_data = self.attachment_encoder.encode(
+                photo_strip_path, individual_photos or []
+            )
+            if strip_data is None:
+                print(f"Could not read photo strip: {photo_strip_path}")
+                return False
+            
+            # Attach photo strip
+            img = MIMEImage(strip_data, _subtype='jpeg')
+            img.add_header('Content-Disposition', 'attachment', 
+                           filename='photobooth_strip.jpg')
+            msg.attach(img)
+            print(f"Attached photo strip: {photo_strip_path}")
+            
+            # Optionally attach individual photos (photo_data follows
+            # individual_photos, so a missing photo doesn't shift the numbers)
+            for i, data in enumerate(photo_data):
+                if data is not None:
+                    img = MIMEImage(data, _subtype='jpeg')
+                    img.add_header('Content-Disposition', 'attachment',
+                                  filename=f'photo_{i+1}.jpg')
+                    msg.attach(img)
+                    print(f"Attached photo {i+1}")
             
             # Connect to Gmail SMTP server
             print("Connecting to Gmail SMTP server...")
@@ -0,0 +1,83 @@
+import os
+from collections import OrderedDict
+
+import cv2
+from PyQt5 import QtGui
+
+from camera.contact_sheet import read_reduced
+
+
+class PixmapCache:
+    def __init__(self, max_entries=24):
+        """
+        Photos decoded and scaled for a label, kept as QPixmaps
+
+        Entries are keyed by path, modification time, file size and
+        target size, so a changed file is loaded again. The least
+        recently used entry is dropped when the cache is full.
+
+        Args:
+            max_entries: Pixmaps kept
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> QPixmap
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, size):
+        """
+        Pixmap of an image at exactly size
+
+        Args:
+            path: Image file
+            size: Tuple (width, height)
+        Returns: QPixmap or None if the file can't be loaded
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (path, stat.st_mtime_ns, stat.st_size, tuple(size))
+
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        pixmap = self._load(path, size)
+        if pixmap is None:
+            return None
+        self.misses += 1
+        self.entries[key] = pixmap
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return pixmap
+
+    def _load(self, path, size):
+        """Decode at reduced scale, resize and convert to a QPixmap"""
+        frame = read_reduced(path, size)
+        if frame is None:
+            return None
+        return self.from_frame(frame, size)
+
+    def from_frame(self, frame, size):
+        """
+        QPixmap of a BGR frame already in memory at exactly size (not cached,
+        for photos whose files/renditions aren't written yet)
+        """
+        # Shrink first so the color conversion runs on the small image
+        resized = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+
+        h, w, ch = rgb.shape
+        qt_image = QtGui.QImage(rgb.data, w, h, ch * w, QtGui.QImage.Format_RGB888)
+        # fromImage copies the pixels, so rgb can go away
+        return QtGui.QPixmap.fromImage(qt_image)
+
+    def get_stats(self):
+        """
+        Get cache counters
+        Returns: Dictionary with entries, hits and misses
+        """
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
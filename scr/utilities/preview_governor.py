@@ -0,0 +1,121 @@
+import time
+
+
+class PreviewGovernor:
+    def __init__(self, target_fps=30, cpu_budget=0.5, min_fps=5):
+        """
+        Pace the preview timer to the time a frame actually takes
+
+        Each tick's grab+render time is measured. When the work would use
+        more than cpu_budget of the UI thread at the current rate, the
+        timer interval widens right away; when there is headroom it eases
+        back toward target_fps. Ticks that arrive a whole interval late
+        (the event loop was blocked) are dropped instead of rendered.
+
+        Args:
+            target_fps: Preview frame rate to aim for
+            cpu_budget: Fraction of the UI thread (0-1) the preview may use
+            min_fps: Slowest the preview is allowed to go
+        """
+        self.target_fps = target_fps
+        self.cpu_budget = cpu_budget
+        self.min_fps = min_fps
+
+        self.min_interval_ms = 1000.0 / target_fps
+        self.max_interval_ms = 1000.0 / min_fps
+        self.reset()
+
+    def reset(self):
+        """Start over at the target frame rate"""
+        self.interval_ms = self.min_interval_ms
+        self.work_ms = 0.0
+        self.fps = 0.0
+        self.tick_start = None
+        self.next_due = None
+        self.last_render_time = None
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+
+    def resume(self):
+        """
+        Call when the preview restarts after a pause (photo review), so
+        the gap isn't counted as a late tick or a slow frame. The rate
+        and work estimates are kept.
+        """
+        self.tick_start = None
+        self.next_due = None
+        self.last_render_time = None
+
+    def start_tick(self):
+        """
+        Call at the start of a timer tick
+
+        Returns:
+            True if the frame should be grabbed and rendered, False if the
+            tick is dropped
+        """
+        now = time.monotonic()
+
+        if self.next_due is not None and now - self.next_due > self.interval_ms / 1000:
+            # Event loop is a whole interval behind, let it catch up
+            self.frames_dropped += 1
+            self.next_due = now + self.interval_ms / 1000
+            return False
+
+        self.tick_start = now
+        return True
+
+    def end_tick(self):
+        """
+        Call after the frame was grabbed and rendered
+
+        Returns:
+            Timer interval in ms to use for the next tick
+        """
+        now = time.monotonic()
+        work_ms = (now - self.tick_start) * 1000
+
+        if self.frames_rendered == 0:
+            self.work_ms = work_ms
+        else:
+            self.work_ms = self.work_ms * 0.8 + work_ms * 0.2
+
+        if self.last_render_time is not None:
+            frame_fps = 1.0 / max(now - self.last_render_time, 1e-6)
+            self.fps = frame_fps if self.fps == 0 else self.fps * 0.9 + frame_fps * 0.1
+        self.last_render_time = now
+        self.frames_rendered += 1
+
+        # Interval at which this much work stays inside the budget
+        needed_ms = self.work_ms / self.cpu_budget
+        if needed_ms > self.interval_ms:
+            # Back off straight away
+            self.interval_ms = min(needed_ms, self.max_interval_ms)
+        else:
+            # Ramp back up gradually so one fast frame doesn't cause a spike
+            self.interval_ms = max(self.min_interval_ms, needed_ms, self.interval_ms * 0.9)
+
+        self.next_due = self.tick_start + self.interval_ms / 1000
+        return int(round(self.interval_ms))
+
+    def get_budget_used(self):
+        """Fraction of the UI thread currently spent on the preview"""
+        if self.interval_ms <= 0:
+            return 0.0
+        return self.work_ms / self.interval_ms
+
+    def get_stats(self):
+        """
+        Get the governor state
+        Returns: Dictionary with current fps, interval and budget use
+        """
+        return {
+            "fps": self.fps,
+            "target_fps": self.target_fps,
+            "interval_ms": self.interval_ms,
+            "work_ms": self.work_ms,
+            "budget_used": self.get_budget_used(),
+            "cpu_budget": self.cpu_budget,
+            "frames_rendered": self.frames_rendered,
+            "frames_dropped": self.frames_dropped,
+        }
@@ -0,0 +1,135 @@
+import time
+
+import cv2
+import numpy as np
+from PyQt5 import QtGui
+
+# Per-frame render budget: a quarter of the 33 ms frame interval at 30 fps
+PREVIEW_TARGET_MS = 8.0
+
+
+class PreviewRenderer:
+    def __init__(self, mirror=True, target_ms=PREVIEW_TARGET_MS):
+        """
+        Turn camera frames into square preview QImages without per-frame allocations
+
+        The square crop is taken as a view of the camera frame, and the
+        resize, mirror and BGR->RGB steps all write into buffers that are
+        allocated once per preview size and reused every tick.
+
+        Args:
+            mirror: Flip horizontally so the preview acts like a mirror
+            target_ms: Per-frame cost the renderer is expected to stay under
+        """
+        self.mirror = mirror
+        self.target_ms = target_ms
+        self.size = None
+
+        # Reused buffers, (re)allocated in _allocate when the size changes
+        self.resized = None
+        self.flipped = None
+        # Two output buffers so the QImage handed out last tick stays
+        # valid while the next one is being written
+        self.outputs = []
+        self.output_index = 0
+
+        # Timing
+        self.frames_rendered = 0
+        self.frames_over_target = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+
+    def _allocate(self, size):
+        """Allocate the working buffers for a preview size"""
+        shape = (size, size, 3)
+        self.resized = np.empty(shape, dtype=np.uint8)
+        self.flipped = np.empty(shape, dtype=np.uint8)
+        self.outputs = [np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8)]
+        self.output_index = 0
+        self.size = size
+
+    def crop_square(self, frame):
+        """
+        Center square of a frame as a view (no copy)
+
+        Args:
+            frame: BGR frame
+        Returns: View of the square region
+        """
+        h, w = frame.shape[:2]
+        if w > h:
+            start_x = (w - h) // 2
+            return frame[:, start_x:start_x + h]
+        start_y = (h - w) // 2
+        return frame[start_y:start_y + w, :]
+
+    def render(self, frame, size):
+        """
+        Render a BGR camera frame into a square RGB QImage
+
+        The QImage shares memory with an internal buffer, it is valid until
+        the next-but-one render() call. Convert it (QPixmap.fromImage) or
+        copy it before then.
+
+        Args:
+            frame: BGR frame of any size
+            size: Width/height of the square output in pixels
+        Returns:
+            QtGui.QImage (Format_RGB888)
+        """
+        start = time.perf_counter()
+
+        if size != self.size:
+            self._allocate(size)
+
+        square = self.crop_square(frame)
+        cv2.resize(square, (size, size), dst=self.resized, interpolation=cv2.INTER_LINEAR)
+
+        source = self.resized
+        if self.mirror:
+            cv2.flip(self.resized, 1, dst=self.flipped)
+            source = self.flipped
+
+        output = self.outputs[self.output_index]
+        self.output_index = 1 - self.output_index
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=output)
+
+        qt_image = QtGui.QImage(output.data, size, size, 3 * size, QtGui.QImage.Format_RGB888)
+
+        self._record_time((time.perf_counter() - start) * 1000)
+        return qt_image
+
+    def _record_time(self, elapsed_ms):
+        """Update the per-frame timing numbers"""
+        self.frames_rendered += 1
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if elapsed_ms > self.target_ms:
+            self.frames_over_target += 1
+        if self.frames_rendered == 1:
+            self.avg_ms = elapsed_ms
+        else:
+            self.avg_ms = self.avg_ms * 0.9 + elapsed_ms * 0.1
+
+    def reset_stats(self):
+        """Reset the timing numbers"""
+        self.frames_rendered = 0
+        self.frames_over_target = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+        self.max_ms = 0.0
+
+    def get_stats(self):
+        """
+        Get render timing
+        Returns: Dictionary with frame count and per-frame cost in ms
+        """
+        return {
+            "frames_rendered": self.frames_rendered,
+            "frames_over_target": self.frames_over_target,
+            "target_ms": self.target_ms,
+            "last_ms": self.last_ms,
+            "avg_ms": self.avg_ms,
+            "max_ms": self.max_ms,
+        }
@@ -0,0 +1,126 @@
+import time
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class PreviewWidget(QtWidgets.QWidget):
+    def __init__(self, parent=None):
+        """
+        Live preview drawn straight from QImages in paintEvent
+
+        Frames are handed over with set_frame and drawn at the next paint
+        without being converted to a QPixmap or scaled (the renderer makes
+        them the widget size). A frame replaced before it was painted is
+        counted as dropped. A countdown overlay is drawn in the same paint.
+        """
+        super().__init__(parent)
+        # Every pixel is painted, Qt doesn't need to clear the background
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
+        self.setAttribute(QtCore.Qt.WA_NoSystemBackground)
+
+        # Double buffered handoff: pending is set between paints,
+        # current is what was painted last
+        self.pending = None
+        self.current = None
+
+        self.overlay_text = ""
+        self.overlay_font = QtGui.QFont("Pacifico", 120)
+        self.overlay_color = QtGui.QColor(255, 255, 255, 170)
+        self.background_color = QtGui.QColor(0, 0, 0)
+
+        self.reset_stats()
+
+    def set_frame(self, qt_image):
+        """
+        Hand a frame over to be drawn at the next paint
+
+        The QImage has to stay valid until the next-but-one set_frame
+        (PreviewRenderer's output buffers do).
+        """
+        if self.pending is not None:
+            self.frames_dropped += 1
+        self.pending = qt_image
+        self.frames_set += 1
+        self.update()
+
+    def set_overlay_color(self, color, alpha=170):
+        """
+        Color of the overlay text
+
+        Args:
+            color: Color name or hex string (e.g. the scheme's text color)
+            alpha: Opacity 0-255, so the guest still shows through
+        """
+        overlay_color = QtGui.QColor(color)
+        overlay_color.setAlpha(alpha)
+        if overlay_color != self.overlay_color:
+            self.overlay_color = overlay_color
+            self.update()
+
+    def set_overlay_text(self, text):
+        """Text drawn over the preview (countdown), "" for none"""
+        if text != self.overlay_text:
+            self.overlay_text = text
+            self.update()
+
+    def clear(self):
+        """Forget the frames (shows the background until the next frame)"""
+        self.pending = None
+        self.current = None
+        self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+
+        if self.pending is not None:
+            self.current = self.pending
+            self.pending = None
+            self.frames_painted += 1
+
+        painter = QtGui.QPainter(self)
+        rect = self.rect()
+        if self.current is None:
+            painter.fillRect(rect, self.background_color)
+        elif self.current.size() == rect.size():
+            painter.drawImage(0, 0, self.current)
+        else:
+            # Shouldn't happen, the renderer makes frames the widget size
+            painter.fillRect(rect, self.background_color)
+            size = self.current.size().scaled(rect.size(), QtCore.Qt.KeepAspectRatio)
+            target = QtCore.QRect(QtCore.QPoint(0, 0), size)
+            target.moveCenter(rect.center())
+            painter.drawImage(target, self.current)
+
+        if self.overlay_text:
+            painter.setFont(self.overlay_font)
+            painter.setPen(self.overlay_color)
+            painter.drawText(rect, QtCore.Qt.AlignCenter, self.overlay_text)
+        painter.end()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.paints += 1
+        self.total_paint_ms += elapsed_ms
+        self.max_paint_ms = max(self.max_paint_ms, elapsed_ms)
+
+    def reset_stats(self):
+        """Reset paint counters"""
+        self.frames_set = 0
+        self.frames_painted = 0
+        self.frames_dropped = 0
+        self.paints = 0
+        self.total_paint_ms = 0.0
+        self.max_paint_ms = 0.0
+
+    def get_stats(self):
+        """
+        Get paint counters
+        Returns: Dictionary with frames set/painted/dropped and paint time in ms
+        """
+        return {
+            "frames_set": self.frames_set,
+            "frames_painted": self.frames_painted,
+            "frames_dropped": self.frames_dropped,
+            "paints": self.paints,
+            "avg_paint_ms": self.total_paint_ms / self.paints if self.paints else 0.0,
+            "max_paint_ms": self.max_paint_ms,
+        }
@@ -1,11 +1,45 @@
 import os
 import subprocess
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+# Canon Selphy borderless postcard: 4x6 in page (w288h432 points) printed
+# at 300 dpi. Borderless prints run past every edge by the bleed, so the
+# raster is the page plus the bleed: 4.16x6.24 in = 1248x1872 pixels.
+SELPHY_MEDIA = "w288h432.Borderless"
+SELPHY_DPI = 300
+SELPHY_PAGE_INCHES = (4, 6)
+SELPHY_BLEED_INCHES = (0.08, 0.12)  # past each edge
+SELPHY_RASTER_SIZE = tuple(round((page + 2 * bleed) * SELPHY_DPI)
+                           for page, bleed in zip(SELPHY_PAGE_INCHES, SELPHY_BLEED_INCHES))
+
+
+def get_print_path(strip_path):
+    """Print-ready copy of a strip (strip_1.jpg -> strip_1_print.jpg)"""
+    base, ext = os.path.splitext(strip_path)
+    return f"{base}_print{ext}"
+
 
 class PrinterManager:
-    def __init__(self):
+    def __init__(self, native_output=True):
+        """
+        Args:
+            native_output: Send strips pre-rendered at the Selphy's raster
+                size with no scaling, instead of letting CUPS fill the page
+        """
         self.printer_name = "selphy"
         self.is_windows = platform.system() == "Windows"
+        self.native_output = native_output
+        self.last_print_timing = None
+
+        # Print copies are rendered here, only for strips that may be printed
+        self.render_executor = ThreadPoolExecutor(max_workers=1)
+        self.print_renders = {}  # strip_path -> Future resolving to the print file
+        self.render_lock = threading.Lock()
     
     
     def is_printer_connected(self):
@@ -52,15 +86,107 @@ class PrinterManager:
             return False
 
     
-    def print_photo_strip(self, strip_path):
+    def render_print_file(self, image, strip_path):
+        """
+        Write the print-ready copy of a strip
+
+        The strip is scaled to cover the printer's raster exactly (same
+        2:3 shape, so only the bleed runs off the page) and tagged with
+        the printer's DPI, so at that DPI it is the page plus the bleed. Written to a temporary
+        file and renamed, so a print never picks up a half written file.
+
+        Args:
+            image: PIL image of the strip (not modified)
+            strip_path: Path of the strip it belongs to
+        Returns:
+            Path to the print file or None
+        """
+        print_path = get_print_path(strip_path)
+        # Per thread, the UI may render it while the worker still is
+        temp_path = f"{print_path}.{threading.get_ident()}.part"
+        raster_w, raster_h = SELPHY_RASTER_SIZE
+        dpi = SELPHY_DPI
+
+        try:
+            # Cover the raster, centered
+            scale = max(raster_w / image.width, raster_h / image.height)
+            size = (round(image.width * scale), round(image.height * scale))
+            rendered = image.convert('RGB').resize(size, Image.Resampling.LANCZOS)
+            left = (size[0] - raster_w) // 2
+            top = (size[1] - raster_h) // 2
+            rendered = rendered.crop((left, top, left + raster_w, top + raster_h))
+
+            rendered.save(temp_path, 'JPEG', quality=95, dpi=(dpi, dpi))
+            os.replace(temp_path, print_path)
+            return print_path
+
+        except Exception as e:
+            print(f"ERROR: Could not render print file: {e}")
+            return None
+
+    def prepare_print_file(self, strip_path):
+        """
+        Start rendering the print copy of a strip in the background
+
+        Called when the guest is asked whether to print, so the copy is
+        usually done by the time they tap yes. Does nothing if it is
+        already there or being rendered.
+
+        Returns: Future resolving to the print file path (or None)
+        """
+        with self.render_lock:
+            future = self.print_renders.get(strip_path)
+            if future is None:
+                future = self.render_executor.submit(self._render_from_strip, strip_path)
+                self.print_renders[strip_path] = future
+        return future
+
+    def get_print_file(self, strip_path, timeout=10.0):
+        """
+        Print-ready copy of a strip, waiting for a render in progress or
+        rendering it now if it was never started
+        Returns: Path to the print file or None
+        """
+        with self.render_lock:
+            future = self.print_renders.pop(strip_path, None)
+        if future is not None:
+            try:
+                print_path = future.result(timeout=timeout)
+                if print_path is not None:
+                    return print_path
+            except Exception as e:
+                print(f"ERROR: Print file render failed: {e}")
+        return self._render_from_strip(strip_path)
+
+    def _render_from_strip(self, strip_path):
+        """Print copy from the strip file (reused if it's already there)"""
+        print_path = get_print_path(strip_path)
+        if os.path.exists(print_path):
+            return print_path
+        try:
+            with Image.open(strip_path) as image:
+                return self.render_print_file(image, strip_path)
+        except Exception as e:
+            print(f"ERROR: Could not open strip for printing: {e}")
+            return None
+
+    def shutdown(self):
+        """Finish print copies being rendered and stop the worker"""
+        self.render_executor.shutdown(wait=True)
+
+    def print_photo_strip(self, strip_path, tap_time=None):
         """
         Print a photo strip on the Selphy
         
         Args:
             strip_path: Path to photo strip image
+            tap_time: time.monotonic() of the print button tap, to report
+                how long it took until the job was accepted
         Returns:
             True if successful, False otherwise
         """
+        start = tap_time if tap_time is not None else time.monotonic()
+
         if self.is_windows:
             print(f"Windows detected - would print: {strip_path}")
             return False
@@ -69,23 +195,51 @@ class PrinterManager:
             print(f"ERROR: Strip not found: {strip_path}")
             return False
         
+        check_start = time.monotonic()
         if not self.is_printer_connected():
             print("ERROR: Selphy not connected or not ready")
             return False
+        check_ms = (time.monotonic() - check_start) * 1000
+
+        render_start = time.monotonic()
+        if self.native_output:
+            # Already the printer's raster (page plus bleed) at its DPI,
+            # placed centered at natural size so CUPS has nothing to rescale
+            print_file = self.get_print_file(strip_path)
+            if print_file is None:
+                return False
+            scaling = ['-o', 'print-scaling=none', '-o', f'ppi={SELPHY_DPI}',
+                       '-o', 'orientation-requested=3']
+        else:
+            print_file = strip_path
+            scaling = ['-o', 'print-scaling=fill']
+        render_ms = (time.monotonic() - render_start) * 1000
         
         try:
+            lp_start = time.monotonic()
             result = subprocess.run([
                 'lp',
                 '-d', self.printer_name,
-                '-o', 'media=w288h432.Borderless',
-                '-o', 'print-scaling=fill',
+                '-o', f'media={SELPHY_MEDIA}',
+                *scaling,
                 '-o', 'media-type=photographic',
                 '-o', 'print-quality=5',
-                strip_path
+                print_file
             ], capture_output=True, text=True)
+            accepted_at = time.monotonic()
             
             if result.returncode == 0:
-                print(f"✓ Print job sent: {strip_path}")
+                self.last_print_timing = {
+                    "native": self.native_output,
+                    "total_ms": (accepted_at - start) * 1000,
+                    "check_ms": check_ms,
+                    "render_ms": render_ms,
+                    "lp_ms": (accepted_at - lp_start) * 1000,
+                }
+                print(f"✓ Print job sent: {print_file}")
+                print(f"Print job accepted {self.last_print_timing['total_ms']:.0f} ms after tap "
+                      f"({'native' if self.native_output else 'scaled'}: printer check {check_ms:.0f} ms, "
+                      f"render {render_ms:.0f} ms, lp {self.last_print_timing['lp_ms']:.0f} ms)")
                 return True
             else:
                 print(f"ERROR printing: {result.stderr}")
@@ -93,4 +247,4 @@ class PrinterManager:
                 
         except Exception as e:
             print(f"ERROR: Failed to print: {e}")
-            return False
\ No newline at end of file
+            return False
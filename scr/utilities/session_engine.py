@@ -0,0 +1,196 @@
+import time
+
+from PyQt5 import QtCore
+
+
+class PhotoSessionEngine:
+    def __init__(self, shot_count=3, countdown_seconds=5, shutter_delay_ms=200, review_ms=500,
+                 on_countdown=None, on_shutter=None, on_capture=None, on_review_done=None,
+                 on_finished=None, parent=None):
+        """
+        Runs the countdown -> shutter -> capture -> review cycle of a session
+
+        Every step is planned on time.monotonic() from the start of its
+        countdown, so a slow frame or capture delays one step but doesn't
+        push all the following ones back. The planned and actual time of
+        each step are recorded (see get_transitions / get_summary).
+
+        Args:
+            shot_count: Photos per session
+            countdown_seconds: Countdown length before each photo
+            shutter_delay_ms: Time between the countdown reaching zero
+                (shutter shown) and the capture
+            review_ms: How long each photo is shown before the next countdown
+            on_countdown: Called with (shot, value) for each countdown number
+            on_shutter: Called with (shot, shutter_time) when the countdown hits zero
+            on_capture: Called with (shot, shutter_time), returns True if
+                the photo was captured
+            on_review_done: Called with (shot) when the next countdown is
+                about to start
+            on_finished: Called with (success) when the session is over
+            parent: QObject owning the timer (the screen), so it lives as
+                long as the screen does
+        """
+        self.shot_count = shot_count
+        self.countdown_seconds = countdown_seconds
+        self.shutter_delay_ms = shutter_delay_ms
+        self.review_ms = review_ms
+
+        self.on_countdown = on_countdown
+        self.on_shutter = on_shutter
+        self.on_capture = on_capture
+        self.on_review_done = on_review_done
+        self.on_finished = on_finished
+
+        # One single-shot timer, re-armed for each planned step
+        self.timer = QtCore.QTimer(parent)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self._fire)
+
+        self.state = "idle"
+        self.shot = 0
+        self.session_start = None
+        self.countdown_start = None
+        self.shutter_time = None
+        self.next_step = None  # (planned_time, name, callback)
+        self.transitions = []
+
+    def is_running(self):
+        """Check if a session is in progress"""
+        return self.state not in ("idle", "done")
+
+    def start(self):
+        """Start a new session at shot 1"""
+        if self.is_running():
+            return
+        self.transitions = []
+        self.session_start = time.monotonic()
+        self.shot = 1
+        self._record("session_start", self.session_start, self.session_start)
+        self._begin_countdown(self.session_start)
+
+    def cancel(self):
+        """Stop the session without calling on_finished"""
+        self.timer.stop()
+        self.next_step = None
+        if self.is_running():
+            self._record("cancelled", time.monotonic(), time.monotonic())
+        self.state = "idle"
+
+    def _schedule(self, planned_time, name, callback):
+        """Arm the timer for a step planned at a monotonic time"""
+        self.next_step = (planned_time, name, callback)
+        delay_ms = max(0, (planned_time - time.monotonic()) * 1000)
+        self.timer.start(int(delay_ms))
+
+    def _fire(self):
+        """Timer fired - run the planned step"""
+        if self.next_step is None:
+            return
+        planned_time, name, callback = self.next_step
+        self.next_step = None
+        actual_time = time.monotonic()
+        self._record(name, planned_time, actual_time)
+        callback(planned_time, actual_time)
+
+    def _record(self, name, planned_time, actual_time):
+        """Keep the planned vs actual time of a transition"""
+        self.transitions.append({
+            "event": name,
+            "shot": self.shot,
+            "planned": planned_time - self.session_start,
+            "actual": actual_time - self.session_start,
+            "late_ms": (actual_time - planned_time) * 1000,
+        })
+
+    def _begin_countdown(self, start_time):
+        """Plan the countdown of the current shot from start_time"""
+        self.state = "countdown"
+        self.countdown_start = start_time
+        self._countdown_step(0, start_time)
+
+    def _countdown_step(self, step, actual_time):
+        """Show countdown number (countdown_seconds - step) and plan the next one"""
+        value = self.countdown_seconds - step
+        if value > 0:
+            if self.on_countdown:
+                self.on_countdown(self.shot, value)
+            # Anchored to the countdown start so late ticks don't add up
+            planned = self.countdown_start + (step + 1)
+            self._schedule(planned, f"countdown_{value - 1}",
+                           lambda p, a: self._countdown_step(step + 1, a))
+        else:
+            self._shutter(actual_time)
+
+    def _shutter(self, actual_time):
+        """Countdown reached zero"""
+        self.state = "shutter"
+        self.shutter_time = actual_time
+        if self.on_shutter:
+            self.on_shutter(self.shot, self.shutter_time)
+        planned = self.countdown_start + self.countdown_seconds + self.shutter_delay_ms / 1000
+        self._schedule(planned, "capture", lambda p, a: self._capture())
+
+    def _capture(self):
+        """Take the photo and move on"""
+        self.state = "capture"
+        success = self.on_capture(self.shot, self.shutter_time) if self.on_capture else True
+        captured_at = time.monotonic()
+        self._record("captured", captured_at, captured_at)
+
+        if not success:
+            self._finish(False)
+        elif self.shot < self.shot_count:
+            self.state = "review"
+            self._schedule(captured_at + self.review_ms / 1000, "review_done",
+                           lambda p, a: self._next_shot(a))
+        else:
+            self._finish(True)
+
+    def _next_shot(self, actual_time):
+        """Review time is over, count down for the next photo"""
+        self.shot += 1
+        if self.on_review_done:
+            self.on_review_done(self.shot)
+        self._begin_countdown(actual_time)
+
+    def _finish(self, success):
+        """End the session"""
+        self.state = "done"
+        end = time.monotonic()
+        self._record("session_end", end, end)
+        self.print_summary()
+        if self.on_finished:
+            self.on_finished(success)
+
+    def get_transitions(self):
+        """
+        Get every recorded transition of the last session
+        Returns: List of dicts with event, shot, planned/actual seconds
+            from session start and late_ms
+        """
+        return list(self.transitions)
+
+    def get_summary(self):
+        """
+        Summarize how accurate the last session's timing was
+        Returns: Dictionary with session length and countdown lateness
+        """
+        ticks = [t for t in self.transitions if t["event"].startswith("countdown_")]
+        late = [t["late_ms"] for t in ticks]
+        duration = self.transitions[-1]["actual"] if self.transitions else 0.0
+        return {
+            "shots": self.shot,
+            "duration_s": duration,
+            "ticks": len(ticks),
+            "avg_late_ms": sum(late) / len(late) if late else 0.0,
+            "max_late_ms": max(late) if late else 0.0,
+        }
+
+    def print_summary(self):
+        """Print the session timing summary"""
+        summary = self.get_summary()
+        print(f"Session timing: {summary['shots']} shots in {summary['duration_s']:.2f} s, "
+              f"countdown ticks late avg {summary['avg_late_ms']:.1f} ms / "
+              f"max {summary['max_late_ms']:.1f} ms")
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from PyQt5 import QtCore
+
+
+class StripTracker(QtCore.QObject):
+    # (strip_path, success) - emitted on the UI thread when a strip is done
+    strip_finished = QtCore.pyqtSignal(str, bool)
+
+    # Internal: carries a finished future from the worker to the UI thread
+    _future_done = QtCore.pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        """
+        Keeps track of strips being rendered in the background
+
+        Screens that need the strip ask here instead of checking whether
+        the file exists yet: is_ready, wait (blocking, with timeout) or
+        when_ready (callback on the UI thread as soon as it's written).
+        """
+        super().__init__(parent)
+        self.futures = {}  # strip_path -> Future resolving to path or None
+        self.callbacks = {}  # strip_path -> [callback(success)]
+        self._future_done.connect(self._on_future_done)
+
+    def track(self, strip_path, future):
+        """
+        Register a strip that is being rendered
+
+        Args:
+            strip_path: Where the strip will be written
+            future: Future resolving to the path (or None on failure)
+        """
+        self.futures[strip_path] = future
+        future.add_done_callback(lambda f: self._future_done.emit(strip_path, f))
+
+    def _on_future_done(self, strip_path, future):
+        """Strip finished (UI thread)"""
+        try:
+            success = future.result() is not None
+        except Exception as e:
+            print(f"Error creating photo strip: {e}")
+            success = False
+
+        if success:
+            print(f"Photo strip created: {strip_path}")
+        else:
+            print("Failed to create photo strip")
+
+        self.strip_finished.emit(strip_path, success)
+        for callback in self.callbacks.pop(strip_path, []):
+            callback(success)
+
+    def is_ready(self, strip_path):
+        """Check if a strip is finished and on disk"""
+        future = self.futures.get(strip_path)
+        if future is not None and not future.done():
+            return False
+        return bool(strip_path) and os.path.exists(strip_path)
+
+    def wait(self, strip_path, timeout=10.0):
+        """
+        Block until a strip is written
+
+        Args:
+            strip_path: Path of the strip
+            timeout: Maximum seconds to wait
+        Returns: True if the strip is on disk
+        """
+        future = self.futures.get(strip_path)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except FutureTimeoutError:
+                print(f"Timed out waiting for strip: {strip_path}")
+                return False
+            except Exception:
+                return False
+        return bool(strip_path) and os.path.exists(strip_path)
+
+    def when_ready(self, strip_path, callback):
+        """
+        Call callback(success) on the UI thread once the strip is done
+
+        Called right away if the strip is already finished (or unknown,
+        in which case success is whether the file exists).
+        """
+        future = self.futures.get(strip_path)
+        if future is None or future.done():
+            QtCore.QTimer.singleShot(0, lambda: callback(self.is_ready(strip_path)))
+            return
+        self.callbacks.setdefault(strip_path, []).append(callback)
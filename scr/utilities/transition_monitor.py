@@ -0,0 +1,304 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from PyQt5 import QtCore, QtWidgets
+
+# Bucket upper edges in ms, the last bucket is everything above
+HISTOGRAM_EDGES_MS = (10, 20, 35, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 2000)
+
+# Events that can start a transition (the tap that is released, a key)
+INPUT_EVENTS = (
+    QtCore.QEvent.MouseButtonRelease,
+    QtCore.QEvent.TouchEnd,
+    QtCore.QEvent.KeyPress,
+)
+
+
+class LatencyHistogram:
+    def __init__(self, edges=HISTOGRAM_EDGES_MS):
+        """
+        Fixed bucket histogram of latencies in ms
+
+        Args:
+            edges: Bucket upper edges in ms
+        """
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        for i, edge in enumerate(self.edges):
+            if ms <= edge:
+                break
+        else:
+            i = len(self.edges)
+        self.counts[i] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """
+        Upper edge of the bucket holding the p-th percentile
+        Returns: ms (the max for the last bucket), None if empty
+        """
+        if not self.count:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.edges[i] if i < len(self.edges) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "max_ms": self.max_ms,
+            "edges_ms": list(self.edges),
+            "buckets": list(self.counts),
+        }
+
+
+class TransitionStats:
+    def __init__(self):
+        """Everything recorded for one from -> to screen pair"""
+        self.total = LatencyHistogram()
+        # Summed ms of each phase / section, averaged in the report
+        self.phase_ms = {}
+        self.section_ms = {}
+
+    def add(self, total_ms, phases, sections):
+        self.total.add(total_ms)
+        for name, ms in phases.items():
+            self.phase_ms[name] = self.phase_ms.get(name, 0.0) + ms
+        for name, ms in sections.items():
+            self.section_ms[name] = self.section_ms.get(name, 0.0) + ms
+
+    def to_dict(self):
+        count = self.total.count or 1
+        return {
+            "total": self.total.to_dict(),
+            "avg_phase_ms": {name: ms / count for name, ms in self.phase_ms.items()},
+            "avg_section_ms": {name: ms / count for name, ms in self.section_ms.items()},
+        }
+
+
+class TransitionMonitor(QtCore.QObject):
+    def __init__(self, window, stacked_widget, screen_names=None, max_input_age=1.0, log=True):
+        """
+        Measures screen transitions from the input that caused them to
+        the first completed paint of the new screen
+
+        An event filter on the screens' buttons and line edits notes the
+        last tap or key press, one on the screens notes the moment the
+        stacked widget starts switching (first Show/Hide of a page), the
+        currentChanged signal marks the hide/showEvent work as done, and
+        one on the window catches its next repaint after it, which it
+        runs itself so the time includes painting and flushing. Nothing
+        else (e.g. the preview widget's paints) goes through the filter.
+        Code that switches screens without a tap calls begin where its
+        work starts, otherwise it is measured from the switch. Work inside
+        the transition (styling, USB/printer/internet checks) can be
+        timed with section.
+
+        Create it after the screens are added to the stacked widget.
+
+        Args:
+            window: Top level window (its repaint ends a transition)
+            stacked_widget: QStackedWidget holding the screens
+            screen_names: Names by index for the report
+            max_input_age: Seconds after which a tap no longer counts as
+                the cause of a switch
+            log: Print a line for every transition
+        """
+        super().__init__(window)
+        self.window = window
+        self.stacked_widget = stacked_widget
+        self.screen_names = screen_names or []
+        self.max_input_age = max_input_age
+        self.log = log
+
+        self.current = None  # transition being measured
+        self.stats = {}  # "from -> to" -> TransitionStats
+        self.last_transition = None
+
+        stacked_widget.currentChanged.connect(self._on_current_changed)
+        window.installEventFilter(self)
+        for i in range(stacked_widget.count()):
+            screen = stacked_widget.widget(i)
+            screen.installEventFilter(self)
+            for widget_type in (QtWidgets.QAbstractButton, QtWidgets.QLineEdit):
+                for widget in screen.findChildren(widget_type):
+                    widget.installEventFilter(self)
+
+    def screen_name(self, index):
+        if index is None:
+            return "?"
+        if 0 <= index < len(self.screen_names):
+            return self.screen_names[index]
+        return str(index)
+
+    def _begin(self, origin, now):
+        self.current = {
+            "origin": origin,
+            "start": now,
+            "switch_start": None,
+            "switched": None,
+            "from": self.stacked_widget.currentIndex(),
+            "to": None,
+            "via": [],
+            "sections": {},
+        }
+
+    def begin(self, origin="timer"):
+        """
+        Start timing a transition now, for code that does work and then
+        switches screens without a tap (e.g. the end of a photo session)
+        """
+        if self.current is None or self.current["to"] is None:
+            self._begin(origin, time.perf_counter())
+
+    def eventFilter(self, watched, event):
+        event_type = event.type()
+
+        if event_type in INPUT_EVENTS:
+            # A new tap replaces one that didn't lead anywhere
+            if self.current is None or self.current["to"] is None:
+                self._begin("input", time.perf_counter())
+
+        elif event_type in (QtCore.QEvent.Show, QtCore.QEvent.Hide):
+            # Buttons being shown/hidden on a screen aren't a switch
+            if watched is not self.window and watched.parentWidget() is self.stacked_widget:
+                self._on_switch_start(time.perf_counter())
+
+        elif event_type == QtCore.QEvent.UpdateRequest:
+            if watched is self.window and self.current is not None and self.current["to"] is not None:
+                # Paint now (instead of returning) to know when it's done
+                paint_start = time.perf_counter()
+                watched.event(event)
+                self._finish(paint_start, time.perf_counter())
+                return True
+
+        return False
+
+    def _on_switch_start(self, now):
+        current = self.current
+        if current is None or (current["to"] is None and
+                               now - (current["switch_start"] or current["start"]) > self.max_input_age):
+            # Nothing (recent) caused it - a timer or code switched screens
+            self._begin("timer", now)
+            current = self.current
+        if current["switch_start"] is None:
+            current["switch_start"] = now
+        elif current["to"] is not None and current["switched"] is not None and now > current["switched"]:
+            # Switched again before the screen got painted (e.g. a screen
+            # that skips itself): the guest sees one transition
+            current["via"].append(current["to"])
+            current["to"] = None
+
+    def _on_current_changed(self, index):
+        """hideEvent/showEvent of the switch are done"""
+        now = time.perf_counter()
+        if self.current is None:
+            self._begin("timer", now)
+        if self.current["switch_start"] is None:
+            self.current["switch_start"] = now
+        self.current["to"] = index
+        self.current["switched"] = now
+
+    def _finish(self, paint_start, paint_end):
+        current = self.current
+        self.current = None
+
+        phases = {
+            "before_switch": (current["switch_start"] - current["start"]) * 1000,
+            "switch": (current["switched"] - current["switch_start"]) * 1000,
+            "until_paint": (paint_start - current["switched"]) * 1000,
+            "paint": (paint_end - paint_start) * 1000,
+        }
+        total_ms = (paint_end - current["start"]) * 1000
+        key = f"{self.screen_name(current['from'])} -> {self.screen_name(current['to'])}"
+        self.stats.setdefault(key, TransitionStats()).add(total_ms, phases, current["sections"])
+
+        self.last_transition = {
+            "key": key,
+            "origin": current["origin"],
+            "via": [self.screen_name(i) for i in current["via"]],
+            "total_ms": total_ms,
+            "phases": phases,
+            "sections": dict(current["sections"]),
+        }
+        if self.log:
+            via = f" via {', '.join(self.last_transition['via'])}" if current["via"] else ""
+            sections = "".join(f", {name} {ms:.0f}" for name, ms in current["sections"].items())
+            print(f"Transition {key}{via}: {total_ms:.0f} ms from {current['origin']} "
+                  f"(before switch {phases['before_switch']:.0f}, switch {phases['switch']:.0f}"
+                  f"{sections}, paint {phases['until_paint'] + phases['paint']:.0f})")
+
+    @contextmanager
+    def section(self, name):
+        """
+        Time a piece of work as part of the transition in progress
+
+        Outside a transition the work just runs.
+
+            with monitor.section("usb"):
+                ...
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                ms = (time.perf_counter() - start) * 1000
+                self.current["sections"][name] = self.current["sections"].get(name, 0.0) + ms
+
+    def get_stats(self):
+        """
+        Get the recorded transitions
+        Returns: Dictionary of "from -> to" -> histogram and average breakdown
+        """
+        return {key: stats.to_dict() for key, stats in sorted(self.stats.items())}
+
+    def reset_stats(self):
+        """Forget all recorded transitions"""
+        self.stats = {}
+        self.last_transition = None
+
+    def dump(self, path=None):
+        """
+        Print a report of all transitions and optionally save them
+
+        Args:
+            path: JSON file to write the full histograms to
+        Returns: Report text
+        """
+        lines = ["Screen transitions (ms):"]
+        for key, stats in self.get_stats().items():
+            total = stats["total"]
+            phases = ", ".join(f"{name} {ms:.1f}" for name, ms in stats["avg_phase_ms"].items())
+            sections = ", ".join(f"{name} {ms:.1f}" for name, ms in stats["avg_section_ms"].items())
+            lines.append(f"  {key}: n={total['count']} avg {total['avg_ms']:.0f} "
+                         f"p50 <={total['p50_ms']:.0f} p90 <={total['p90_ms']:.0f} max {total['max_ms']:.0f}")
+            lines.append(f"      avg {phases}" + (f" | {sections}" if sections else ""))
+        if len(lines) == 1:
+            lines.append("  none recorded")
+        report = "\n".join(lines)
+        print(report)
+
+        if path:
+            temp_path = path + ".part"
+            with open(temp_path, "w") as f:
+                json.dump(self.get_stats(), f, indent=2)
+            os.replace(temp_path, path)
+            print(f"Transition stats saved: {path}")
+        return report
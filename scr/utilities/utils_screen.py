@@ -103,41 +103,46 @@ def get_all_color_schemes():
         8: BLACK_GOLD
     }
 
-def set_background(background, color_number):
-    """
-    Set solid color background based on color scheme number
-    
-    Args:
-        background: QLabel widget to set background
-        color_number: Integer for color scheme (1-7)
-    """
-    color_scheme = get_color_scheme(color_number)
-    background.setStyleSheet(f"background-color: {color_scheme['background']};")
-    background.lower()
+# Compiled application stylesheets, one per color scheme
+_stylesheets = {}
+# Scheme currently applied to the application (None until the first apply_theme)
+_applied_scheme = None
 
 
-def style_button(button, color_number, border_radius=30):
+def compile_stylesheet(color_number, button_radius=30, line_edit_radius=15):
     """
-    Style a button with rounded corners based on color scheme
+    Build the application stylesheet for a color scheme (once per scheme)
+    
+    Widgets are matched by type, and by the themeRole / themeState dynamic
+    properties for the special cases (screen background, error input), so
+    the whole app is themed by one setStyleSheet call. Widgets keep the
+    font set in designer since the stylesheet sets no fonts.
     
     Args:
-        button: QPushButton to style
-        color_number: Integer for color scheme (1-7)
-        border_radius: Radius for rounded corners (default 30)
+        color_number: Integer for color scheme (1-8)
+        button_radius: Radius for rounded button corners
+        line_edit_radius: Radius for rounded line edit corners
+    Returns:
+        Stylesheet string
     """
-    color_scheme = get_color_scheme(color_number)
-    
-    # Get current font size
-    font_size = button.font().pointSize()
+    key = (color_number, button_radius, line_edit_radius)
+    if key in _stylesheets:
+        return _stylesheets[key]
     
+    color_scheme = get_color_scheme(color_number)
     stylesheet = f"""
+        QLabel {{
+            color: {color_scheme['text']};
+        }}
+        QLabel[themeRole="background"] {{
+            background-color: {color_scheme['background']};
+        }}
         QPushButton {{
             background-color: {color_scheme['button_background']};
             color: {color_scheme['text']};
-            border-radius: {border_radius}px;
+            border-radius: {button_radius}px;
             border: 4px solid {color_scheme['border']};
             padding: 10px;
-            font-size: {font_size}pt;
             outline: none;
         }}
         QPushButton:hover {{
@@ -151,103 +156,80 @@ def style_button(button, color_number, border_radius=30):
         QPushButton:focus {{
             outline: none;
         }}
+        QLineEdit {{
+            border: 4px solid {color_scheme['border']};
+            border-radius: {line_edit_radius}px;
+            padding: 10px;
+            background-color: white;
+            color: {color_scheme['button_background']};
+        }}
+        QLineEdit:focus {{
+            border: 4px solid {color_scheme['button_background']};
+        }}
+        QLineEdit[themeState="error"] {{
+            border: 4px solid red;
+            color: red;
+        }}
     """
-    button.setStyleSheet(stylesheet)
+    _stylesheets[key] = stylesheet
+    return stylesheet
 
 
-def style_all_buttons(widget, color_number, border_radius=30):
+def apply_theme(color_number, force=False):
     """
-    Apply styling to all buttons in a widget
+    Theme the whole application with a color scheme
     
-    Args:
-        widget: Parent widget containing buttons
-        color_number: Integer for color scheme (1-7)
-        border_radius: Radius for rounded corners (default 30)
-    """
-    buttons = widget.findChildren(QtWidgets.QPushButton)
-    for button in buttons:
-        style_button(button, color_number, border_radius)
-
-
-def style_label(label, color_number):
-    """
-    Style a label text to match the color scheme
+    Does nothing if the scheme is already applied, so screens can call
+    it from showEvent without Qt re-polishing anything.
     
     Args:
-        label: QLabel to style
-        color_number: Integer for color scheme (1-7)
+        color_number: Integer for color scheme (1-8)
+        force: Apply even if the scheme didn't change
+    Returns:
+        True if the stylesheet was (re)applied
     """
-    color_scheme = get_color_scheme(color_number)
+    global _applied_scheme
+    if color_number == _applied_scheme and not force:
+        return False
     
-    # Get current font size
-    font_size = label.font().pointSize()
-    
-    stylesheet = f"""
-        QLabel {{
-            color: {color_scheme['text']};
-            font-size: {font_size}pt;
-        }}
-    """
-    label.setStyleSheet(stylesheet)
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        return False
+    app.setStyleSheet(compile_stylesheet(color_number))
+    _applied_scheme = color_number
+    return True
 
 
-def style_all_labels(widget, color_number):
+def set_theme_state(widget, state):
     """
-    Apply text color styling to all labels in a widget
+    Set a widget's themeState (e.g. "error", "" for normal) and restyle it
     
     Args:
-        widget: Parent widget containing labels
-        color_number: Integer for color scheme (1-7)
+        widget: Widget to update
+        state: State name matched by the stylesheet
     """
-    labels = widget.findChildren(QtWidgets.QLabel)
-    for label in labels:
-        # Don't style the background label or image labels
-        if label.objectName() not in ['background', 'label_image_1', 'label_image_2', 'label_image_3', 'label_countdown', 'label_countdown_2']:
-            style_label(label, color_number)
+    if widget.property("themeState") == state:
+        return
+    widget.setProperty("themeState", state)
+    # Dynamic properties aren't watched by Qt, re-polish just this widget
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
 
 
-def style_line_edit(line_edit, color_number, border_radius=15):
-    """
-    Style a line edit (text input) to match the color scheme
-    
-    Args:
-        line_edit: QLineEdit to style
-        color_number: Integer for color scheme (1-7)
-        border_radius: Radius for rounded corners (default 15)
-    """
-    color_scheme = get_color_scheme(color_number)
-    
-    # Get current font size
-    font_size = line_edit.font().pointSize()
-    
-    stylesheet = f"""
-        QLineEdit {{
-            border: 4px solid {color_scheme['border']};
-            border-radius: {border_radius}px;
-            padding: 10px;
-            background-color: white;
-            color: {color_scheme['button_background']};
-            font-size: {font_size}pt;
-        }}
-        QLineEdit:focus {{
-            border: 4px solid {color_scheme['button_background']};
-        }}
-    """
-    line_edit.setStyleSheet(stylesheet)
-
-
-def style_all_line_edits(widget, color_number, border_radius=15):
+def set_background(background, color_number):
     """
-    Apply styling to all line edits in a widget
+    Make a label the screen background and apply the color scheme
     
     Args:
-        widget: Parent widget containing line edits
-        color_number: Integer for color scheme (1-7)
-        border_radius: Radius for rounded corners (default 15)
+        background: QLabel widget to set background
+        color_number: Integer for color scheme (1-8)
     """
-    line_edits = widget.findChildren(QtWidgets.QLineEdit)
-    for line_edit in line_edits:
-        style_line_edit(line_edit, color_number, border_radius)
+    if background.property("themeRole") != "background":
+        background.setProperty("themeRole", "background")
+        background.style().unpolish(background)
+        background.style().polish(background)
+    background.lower()
+    apply_theme(color_number)
 
 
 def lighten_color(hex_color, percent):